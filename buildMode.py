@@ -0,0 +1,121 @@
+import os
+import time
+from contextlib import contextmanager
+
+from maya import cmds
+from rigBuilder.files.core import JsonFile
+
+# nested builds (a ComponentBuilder inside a StepBuilder step) leave the settings to the outermost one
+depth = 0
+
+
+def isActive():  # type: () -> bool
+    return depth > 0
+
+
+@contextmanager
+def fastBuild(dgEvaluation=False):  # type: (bool) -> None
+    """
+    Suspends undo, viewport refresh and autosave, and optionally evaluates in DG mode, restoring them on exit.
+    The undo queue is flushed, what was done before the build can't be undone afterwards.
+    """
+    global depth
+
+    depth += 1
+    if depth > 1:
+        try:
+            yield
+        finally:
+            depth -= 1
+        return
+
+    undoState = cmds.undoInfo(q=True, state=True)
+    autoSaveState = cmds.autoSave(q=True, enable=True)
+    evaluationMode = cmds.evaluationManager(q=True, mode=True)[0] if dgEvaluation else None
+
+    try:
+        # keeping the queue would let an undo replay old operations on the scene the build changed
+        cmds.undoInfo(state=False)
+        cmds.autoSave(enable=False)
+        cmds.refresh(suspend=True)
+        if dgEvaluation:
+            cmds.evaluationManager(mode='off')
+
+        yield
+    finally:
+        depth -= 1
+
+        if dgEvaluation:
+            cmds.evaluationManager(mode=evaluationMode)
+        cmds.refresh(suspend=False)
+        cmds.autoSave(enable=autoSaveState)
+        cmds.undoInfo(state=undoState)
+        cmds.refresh()
+
+
+# builds kept per workspace to compare the two modes
+historySize = 20
+
+
+def loadHistory(path):  # type: (str) -> list
+    if not os.path.isfile(path):
+        return list()
+
+    # another build may have left it unreadable, the history is only informative
+    try:
+        history = JsonFile(path).load()
+    except (IOError, OSError, ValueError):
+        return list()
+    return history if isinstance(history, list) else list()
+
+
+def recordBuild(path, fast, total, steps):  # type: (str, bool, float, List[(str, str, float, int)]) -> dict
+    build = {
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'fast': fast,
+        'total': total,
+        'steps': [list(step) for step in steps],
+    }
+
+    history = loadHistory(path)
+    history.append(build)
+
+    # builds on several machines share the workspace, the file is replaced whole so it's never seen half written
+    JsonFile(path).dump(history[-historySize:], force=True)
+
+    return build
+
+
+def getComparison(history, build):  # type: (list, dict) -> dict or None
+    """
+    Pairs the given build with the latest one made in the other mode.
+    """
+    other = None
+    for previous in reversed(history):
+        if previous is not build and previous['fast'] != build['fast']:
+            other = previous
+            break
+    if other is None:
+        return None
+
+    fast, slow = (build, other) if build['fast'] else (other, build)
+    slowTimes = dict((step[0], step[2]) for step in slow['steps'])
+    steps = [
+        (step[0], slowTimes[step[0]], step[2])
+        for step in fast['steps']
+        if step[0] in slowTimes
+    ]
+    return {'total': (slow['total'], fast['total']), 'steps': steps}
+
+
+def getSpeedup(slow, fast):  # type: (float, float) -> str
+    if not fast:
+        return '-'
+    return '{:.2f}x'.format(slow / fast)
+
+
+def printComparison(comparison):  # type: (dict) -> None
+    slow, fast = comparison['total']
+    print('---> Fast build mode: {} seconds, normal: {} seconds ({})'.format(fast, slow, getSpeedup(slow, fast)))
+    for name, slow, fast in comparison['steps']:
+        print('# {}: {} -> {} seconds ({})'.format(name, slow, fast, getSpeedup(slow, fast)))
@@ -1,8 +1,10 @@
 import re
 
 from maya import cmds
+from rigBuilder import tracing
+from rigBuilder.buildMode import fastBuild
 from rigBuilder.types import Side, Color, UnsignedInt, Matrix, Vector, StringArray
-from rigBuilder.core import Data
+from rigBuilder.core import Data, DataRecord, expand
 from collections import OrderedDict
 
 
@@ -149,7 +151,7 @@ class Component(Data):
         self.color = self.color.mirrored()
 
     def mirrored(self):
-        copy = self.copy()
+        copy = self.shallowCopy()
         copy.mirror()
         return copy
 
@@ -196,6 +198,8 @@ class Component(Data):
 
 class ComponentBuilder(Data):
 
+    compactable = False
+
     def __init__(self, componentDict=None, connectionDict=None, disabledComponents=None, disabledConnections=None):
         # type: (dict[str: Component], dict[str:Connection], List[str], List[str]) -> None
         super(ComponentBuilder, self).__init__()
@@ -205,7 +209,15 @@ class ComponentBuilder(Data):
         self.componentDict = componentDict if componentDict is not None else dict()
         self.connectionDict = connectionDict if connectionDict is not None else dict()
 
-    def build(self, controlSet=False):
+    def build(self, controlSet=False, fast=False):  # type: (bool, bool) -> None
+        # inside a StepBuilder's fast build the mode is already set, fast only matters for a standalone build
+        if fast:
+            with fastBuild():
+                self.buildComponents(controlSet=controlSet)
+        else:
+            self.buildComponents(controlSet=controlSet)
+
+    def buildComponents(self, controlSet=False):  # type: (bool) -> None
         folder = cmds.group(empty=True, name='setup')
 
         componentDict = dict()
@@ -213,8 +225,9 @@ class ComponentBuilder(Data):
         for key, component in self.componentDict.items():
             if key in self.disabledComponents:
                 continue
-            copiedComponent = component.copy()
-            copiedComponent.build()
+            copiedComponent = component.expand() if isinstance(component, DataRecord) else component.shallowCopy()
+            with tracing.span(key, 'component', countNodes=True, type=copiedComponent.__class__.__name__):
+                copiedComponent.build()
 
             sets = list()
             if controlSet:
@@ -225,7 +238,8 @@ class ComponentBuilder(Data):
             mirrorComponent = None
             if copiedComponent.bilateral:
                 mirrorComponent = copiedComponent.mirrored()
-                mirrorComponent.build()
+                with tracing.span(str(mirrorComponent), 'component', countNodes=True, mirrorOf=key):
+                    mirrorComponent.build()
 
                 if controlSet:
                     sets.append(mirrorComponent.buildControlSet())
@@ -252,10 +266,12 @@ class ComponentBuilder(Data):
         for key, connection in self.connectionDict.items():
             if key in self.disabledConnections:
                 continue
-            connection.copy().build(componentDict)
+            connection = expand(connection)
+            with tracing.span(key, 'connection'):
+                connection.shallowCopy().build(componentDict)
 
-            if connection.bilateral:
-                connection.build(mirroredComponentDict)
+                if connection.bilateral:
+                    connection.build(mirroredComponentDict)
 
 
 class Guide(str):
@@ -1,5 +1,6 @@
 from maya import cmds
 from maya.api import OpenMaya
+from rigBuilder import tracing
 from rigBuilder.components.core import Guide
 from rigBuilder.components.limb import Limb
 from rigBuilder.components.utils import matrixConstraint
@@ -32,6 +33,7 @@ class Leg(Limb):
         self.footOutGuide = self.footOutGuide.mirrored()
         self.toesGuide = self.toesGuide.mirrored()
 
+    @tracing.traced('component')
     def ikSetup(self, mainCtrl, switchPlug):
         joints, legIkCtrlBuffer, legIkCtrl, legIkHandle = super(Leg, self).ikSetup(mainCtrl, switchPlug)
 
@@ -113,6 +115,7 @@ class Leg(Limb):
             cmds.connectAttr('{}.matrixSum'.format(offsetMatrix), '{}.matrixIn[0]'.format(m), force=True)
         return joints, legIkCtrlBuffer, legIkCtrl, legIkHandle
 
+    @tracing.traced('component')
     def fkSetup(self, mainCtrl, switchPlug):
         ctrls, reverseNode = super(Leg, self).fkSetup(mainCtrl, switchPlug)
 
@@ -1,6 +1,7 @@
 from __future__ import division
 from maya import cmds
 from maya.api import OpenMaya
+from rigBuilder import tracing
 from rigBuilder.components.core import Component, Guide, Storage
 from rigBuilder.components.nodeUtils import MultMatrix, DecomposeMatrix, QuatToEuler, RotateOrder, ComposeMatrix, \
     BlendMatrixCustom, Transform, DistanceBetween, MultiplyDivide, BlendColors, Node
@@ -140,6 +141,7 @@ class Limb(Component):
 
         return ['{}.matrixSum'.format(m) for m in resultMatrices]
 
+    @tracing.traced('component')
     def ikSetup(self, mainCtrl, switchPlug):
         # joints
         joints = list()
@@ -213,6 +215,7 @@ class Limb(Component):
 
         return joints, legIkCtrlBuffer, legIkCtrl, legIkHandle
 
+    @tracing.traced('component')
     def fkSetup(self, mainCtrl, switchPlug):
         reverseNode = cmds.createNode('reverse')
         cmds.connectAttr(switchPlug, '{}.inputX'.format(reverseNode))
@@ -268,6 +271,7 @@ class Limb(Component):
 
         return resultPlugMatrices
 
+    @tracing.traced('component')
     def ribbonSetup(self, mainCtrl, startMatrixPlug, endMatrixPlug, sections, name, squashStrengthPlug, benderPlug):
         startMatrix = cmds.getAttr(startMatrixPlug)
         endMatrix = cmds.getAttr(endMatrixPlug)
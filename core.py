@@ -1,3 +1,5 @@
+import hashlib
+import numbers
 from inspect import getargspec
 
 
@@ -12,16 +14,167 @@ def getAllAncestors(cl, data=None):
     return data
 
 
-class Data(object):
+def getFields(cl):  # type: (type) -> tuple
+    fields = list()
+
+    for ancestor in reversed(cl.__mro__):
+        if ancestor is object or '__init__' not in ancestor.__dict__:
+            continue
+        for arg in getargspec(ancestor.__init__).args[1:]:
+            if arg not in fields:
+                fields.append(arg)
+
+    return tuple(fields)
+
+
+def hashValue(value, hasher, children=None):  # type: (any, hashlib.sha1, list) -> None
+    if isinstance(value, (Data, DataRecord)):
+        hasher.update(b'D')
+        hasher.update(value.contentHash().encode('ascii'))
+        if children is not None and isinstance(value, Data):
+            children.append(value)
+        return
+
+    # builtin containers and scalars share a label so data hashes the same before and after a json round trip
+    t = type(value)
+    if t.__module__ not in ('__builtin__', 'builtins', 'collections'):
+        hasher.update(t.__name__.encode('utf-8'))
+    hasher.update(b'\x00')
+
+    if value is None:
+        hasher.update(b'N')
+    elif isinstance(value, bool):
+        hasher.update(b'T' if value else b'F')
+    elif isinstance(value, numbers.Integral):
+        hasher.update(b'i')
+        hasher.update(str(int(value)).encode('ascii'))
+    elif isinstance(value, numbers.Real):
+        hasher.update(b'f')
+        hasher.update(repr(float(value)).encode('ascii'))
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b'l')
+        hasher.update(str(len(value)).encode('ascii'))
+        for v in value:
+            hashValue(v, hasher, children)
+    elif isinstance(value, dict):
+        hasher.update(b'd')
+        hasher.update(str(len(value)).encode('ascii'))
+        for k, v in value.items():
+            hashValue(k, hasher, children)
+            hashValue(v, hasher, children)
+    elif isinstance(value, (str, type(u''))):
+        encoded = value.encode('utf-8') if isinstance(value, type(u'')) else value
+        hasher.update(b's')
+        hasher.update(str(len(encoded)).encode('ascii'))
+        hasher.update(encoded)
+    else:
+        hasher.update(b'r')
+        hasher.update(repr(value).encode('utf-8'))
+
+    # wrappers like Guide carry extra state besides their value
+    state = getattr(value, '__dict__', None) if not isinstance(value, dict) else None
+    if state:
+        hashValue(sorted(state.items()), hasher, children)
+
+
+def contentHash(dataClass, items, children=None):  # type: (type, list, list) -> str
+    hasher = hashlib.sha1()
+    hasher.update('{}.{}'.format(dataClass.__module__, dataClass.__name__).encode('utf-8'))
+    for key, value in items:
+        hashValue(key, hasher)
+        hashValue(value, hasher, children)
+    return hasher.hexdigest()
+
+
+def duplicate(value):  # type: (any) -> any
+    # containers are duplicated without running their constructors, everything else is shared
+    if isinstance(value, Data):
+        return value.shallowCopy()
+    if isinstance(value, list):
+        valueCopy = list.__new__(type(value))
+        list.extend(valueCopy, value)
+        if getattr(value, '__dict__', None):
+            valueCopy.__dict__.update(value.__dict__)
+        return valueCopy
+    if isinstance(value, dict):
+        return type(value)(value)
+    return value
+
+
+immutableTypes = frozenset(type(v) for v in (None, True, 0, 2 ** 64, 0.0, '', u''))
+
+
+def deepDuplicate(value):  # type: (any) -> any
+    # like duplicate but all the way down, immutable leaves are still shared
+    valueType = type(value)
+    if valueType in immutableTypes:
+        return value
+    if valueType is list:
+        return [v if type(v) in immutableTypes else deepDuplicate(v) for v in value]
+    if isinstance(value, Data):
+        cls = value.__class__
+        valueCopy = cls.__new__(cls)
+        state = valueCopy.__dict__
+        for key, v in cls.blankState().items():
+            state[key] = duplicate(v)
+        for key in cls._fields:
+            state[key] = deepDuplicate(getattr(value, key))
+        return valueCopy
+    if isinstance(value, DataRecord):
+        valueCopy = value.__class__.__new__(value.__class__)
+        for key in value.dataClass._fields:
+            setattr(valueCopy, key, deepDuplicate(getattr(value, key)))
+        return valueCopy
+    if isinstance(value, list):
+        valueCopy = list.__new__(valueType)
+        list.extend(valueCopy, [deepDuplicate(v) for v in value])
+        if getattr(value, '__dict__', None):
+            valueCopy.__dict__.update(value.__dict__)
+        return valueCopy
+    if isinstance(value, dict):
+        return valueType((k, deepDuplicate(v)) for k, v in value.items())
+    if valueType is tuple:
+        return tuple(deepDuplicate(v) for v in value)
+    return value
+
+
+def isFrozen(value):  # type: (any) -> bool
+    # data is checked through its own memo, other values must not be changeable in place
+    valueType = type(value)
+    if valueType in immutableTypes or isinstance(value, Data):
+        return True
+    if valueType is tuple:
+        return all(isFrozen(v) for v in value)
+    if isinstance(value, (list, dict, set, DataRecord)):
+        return False
+    return not getattr(value, '__dict__', None)
+
+
+class DataType(type):
+
+    def __init__(cls, name, bases, attrs):
+        super(DataType, cls).__init__(name, bases, attrs)
+
+        cls._fields = getFields(cls)
+        cls._fieldSet = frozenset(cls._fields)
+
+
+class Data(DataType('DataBase', (object,), {})):
+
+    compactable = True
 
     def __init__(self, *args, **kwargs):
         super(Data, self).__init__()
 
+    def __setattr__(self, key, value):
+        super(Data, self).__setattr__(key, value)
+        self.__dict__['_contentHashMemo'] = None
+
     def __iter__(self):
         return iter(self.items())
 
     def __getitem__(self, item):
-        if item in self.keys():
+        if item in self._fieldSet:
             return getattr(self, item)
         else:
             raise ValueError('No item found for \'{}\''.format(item))
@@ -39,24 +192,123 @@ class Data(object):
     def __ne__(self, other):
         return self.__eq__(other)
 
+    @classmethod
+    def fields(cls):  # type: () -> tuple
+        return cls._fields
+
     def keys(self):
-        args = list()
+        return list(self._fields)
+
+    def values(self):
+        return [getattr(self, k) for k in self._fields]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self._fields]
+
+    def copy(self):
+        return self.__class__(**dict(self))
+
+    @classmethod
+    def blankState(cls):  # type: () -> dict
+        if '_blankState' not in cls.__dict__:
+            cls._blankState = {k: v for k, v in vars(cls()).items() if k not in cls._fieldSet}
+        return cls.__dict__['_blankState']
+
+    def shallowCopy(self):
+        cls = self.__class__
+        dataCopy = cls.__new__(cls)
+
+        state = dataCopy.__dict__
+        for key, value in cls.blankState().items():
+            state[key] = duplicate(value)
+
+        for key in cls._fields:
+            state[key] = duplicate(getattr(self, key))
 
-        for cl in getAllAncestors(self.__class__) + [self.__class__]:
-            if cl is object:
-                continue
-            argSpec = getargspec(cl.__init__).args
-            for arg in argSpec[1:]:
-                if arg not in args:
-                    args.append(arg)
+        return dataCopy
 
-        return args
+    def contentHash(self):  # type: () -> str
+        memo = self.__dict__.get('_contentHashMemo')
+        if memo is not None:
+            digest, children = memo
+            if all(child.contentHash() == childDigest for child, childDigest in children):
+                return digest
+
+        children = list()
+        digest = contentHash(self.__class__, self.items(), children)
+
+        # containers can change in place without going through __setattr__, they are hashed again on every call
+        if all(isFrozen(v) for v in self.values()):
+            self.__dict__['_contentHashMemo'] = digest, [(child, child.contentHash()) for child in children]
+        else:
+            self.__dict__['_contentHashMemo'] = None
+        return digest
+
+    @classmethod
+    def recordType(cls):  # type: () -> type
+        if '_recordType' not in cls.__dict__:
+            cls._recordType = type(
+                '{}Record'.format(cls.__name__),
+                (DataRecord,),
+                {'__slots__': cls._fields, '__module__': cls.__module__, 'dataClass': cls},
+            )
+        return cls.__dict__['_recordType']
+
+    def compact(self):  # type: () -> DataRecord
+        return self.recordType()(**dict(self))
+
+
+class DataRecord(object):
+
+    __slots__ = ()
+    dataClass = Data
+
+    def __init__(self, **kwargs):
+        for key in self.dataClass._fields:
+            setattr(self, key, kwargs[key])
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __getitem__(self, item):
+        if item in self.dataClass._fieldSet:
+            return getattr(self, item)
+        else:
+            raise ValueError('No item found for \'{}\''.format(item))
+
+    def __repr__(self):
+        kwargsStr = ', '.join(['{}={}'.format(k, repr(v)) for k, v in self.items()])
+        return '{}({})'.format(self.__class__.__name__, kwargsStr)
+
+    def __eq__(self, other):
+        if not isinstance(other, DataRecord) or other.dataClass is not self.dataClass:
+            return False
+
+        return self.items() == other.items()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def keys(self):
+        return list(self.dataClass._fields)
 
     def values(self):
-        return [self.__getattribute__(k) for k in self.keys()]
+        return [getattr(self, k) for k in self.dataClass._fields]
 
     def items(self):
-        return zip(self.keys(), self.values())
+        return [(k, getattr(self, k)) for k in self.dataClass._fields]
 
     def copy(self):
-        return self.__class__(**dict(self))
+        return self.expand().compact()
+
+    def contentHash(self):  # type: () -> str
+        return contentHash(self.dataClass, self.items())
+
+    def expand(self):  # type: () -> Data
+        return self.dataClass(**dict(self))
+
+
+def expand(data):  # type: (Data or DataRecord) -> Data
+    if isinstance(data, DataRecord):
+        return data.expand()
+    return data
@@ -0,0 +1,137 @@
+import hashlib
+from collections import OrderedDict
+
+from rigBuilder.core import Data, DataRecord, hashValue
+
+
+class Replace(Data):
+
+    def __init__(self, value=None):
+        super(Replace, self).__init__()
+        self.value = value
+
+
+class DataDelta(Data):
+
+    def __init__(self, changes=None):
+        super(DataDelta, self).__init__()
+        self.changes = OrderedDict(changes) if changes is not None else OrderedDict()
+
+
+class DictDelta(Data):
+
+    def __init__(self, added=None, removed=None, changed=None, order=None):
+        super(DictDelta, self).__init__()
+        self.added = OrderedDict(added) if added is not None else OrderedDict()
+        self.removed = list(removed) if removed is not None else list()
+        self.changed = OrderedDict(changed) if changed is not None else OrderedDict()
+        self.order = list(order) if order is not None else None
+
+    def affectedKeys(self):  # type: () -> List[str]
+        return list(self.added.keys()) + self.removed + list(self.changed.keys())
+
+
+def dataClassOf(value):  # type: (any) -> type or None
+    if isinstance(value, DataRecord):
+        return value.dataClass
+    if isinstance(value, Data):
+        return value.__class__
+    return None
+
+
+def isSame(a, b):  # type: (any, any) -> bool
+    if a is b:
+        return True
+
+    if dataClassOf(a) is not None and dataClassOf(b) is not None:
+        return a.contentHash() == b.contentHash()
+
+    hasherA = hashlib.sha1()
+    hasherB = hashlib.sha1()
+    hashValue(a, hasherA)
+    hashValue(b, hasherB)
+    return hasherA.digest() == hasherB.digest()
+
+
+def diff(a, b):  # type: (any, any) -> Data or None
+    if isSame(a, b):
+        return None
+
+    dataClass = dataClassOf(a)
+    if dataClass is not None and dataClass is dataClassOf(b):
+        changes = OrderedDict()
+        for key in dataClass.fields():
+            delta = diff(getattr(a, key), getattr(b, key))
+            if delta is not None:
+                changes[key] = delta
+        return DataDelta(changes=changes)
+
+    if isinstance(a, dict) and isinstance(b, dict):
+        added = OrderedDict((k, v) for k, v in b.items() if k not in a)
+        removed = [k for k in a.keys() if k not in b]
+
+        changed = OrderedDict()
+        for key, value in b.items():
+            if key not in a:
+                continue
+            delta = diff(a[key], value)
+            if delta is not None:
+                changed[key] = delta
+
+        order = None
+        if [k for k in a.keys() if k in b] + list(added.keys()) != list(b.keys()):
+            order = list(b.keys())
+
+        return DictDelta(added=added, removed=removed, changed=changed, order=order)
+
+    return Replace(value=b)
+
+
+def patch(a, delta):  # type: (any, Data) -> any
+    if delta is None:
+        return a
+
+    if isinstance(delta, Replace):
+        return delta.value
+
+    if isinstance(delta, DataDelta):
+        dataClass = dataClassOf(a)
+        if dataClass is None:
+            raise TypeError('Cannot apply a DataDelta to \'{}\'.'.format(type(a).__name__))
+
+        kwargs = dict(a)
+        for key, fieldDelta in delta.changes.items():
+            kwargs[key] = patch(kwargs[key], fieldDelta)
+
+        patched = dataClass(**kwargs)
+        return patched.compact() if isinstance(a, DataRecord) else patched
+
+    if isinstance(delta, DictDelta):
+        if not isinstance(a, dict):
+            raise TypeError('Cannot apply a DictDelta to \'{}\'.'.format(type(a).__name__))
+
+        patched = OrderedDict()
+        for key, value in a.items():
+            if key in delta.removed:
+                continue
+            patched[key] = patch(value, delta.changed.get(key))
+
+        for key, value in delta.added.items():
+            patched[key] = value
+
+        if delta.order is not None:
+            patched = OrderedDict((k, patched[k]) for k in delta.order)
+
+        return patched
+
+    raise TypeError('Unknown delta type \'{}\'.'.format(type(delta).__name__))
+
+
+def changedKeys(delta, field):  # type: (DataDelta, str) -> List[str]
+    if delta is None:
+        return list()
+
+    fieldDelta = delta.changes.get(field)
+    if isinstance(fieldDelta, DictDelta):
+        return fieldDelta.affectedKeys()
+    return list()
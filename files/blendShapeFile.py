@@ -1,15 +1,24 @@
 from maya import OpenMayaAnim, OpenMaya
 from maya import cmds
+from rigBuilder import tracing
 from rigBuilder.files.core import JsonFile
+from rigBuilder.files.precision import blendShapePrecision
+from rigBuilder.files.jsonArchive import TypedArray
 
 
 class BlendShapeFile(JsonFile):
 
+    mapArrays = True
+    typedArrays = True
+
+    indent = None
+    precision = blendShapePrecision
+
     def getSelectedMeshes(self):
         meshes = cmds.listRelatives(cmds.ls(sl=True, type='transform'), type='mesh', allDescendents=True) or list()
         return [m for m in meshes if not cmds.getAttr('{}.intermediateObject'.format(m))]
 
-    def export(self, meshes=None, force=False):
+    def export(self, meshes=None, force=False, exact=True):
         data = dict()
 
         meshes = meshes if meshes is not None else self.getSelectedMeshes()
@@ -44,12 +53,34 @@ class BlendShapeFile(JsonFile):
                     'geometry': geometries[0]
                 }
 
-        self.dump(data, force=force)
+        self.dump(data, force=force, exact=exact)
 
-    def import_(self):
-        data = self.load()
+    def summarize(self, key, value):
+        return {
+            'geometry': value.get('geometry'),
+            'targets': list(value.get('targets', dict()).keys()),
+        }
+
+    @property
+    def targets(self):
+        t = list()
+        for blendShape, summary in self.summaries().items():
+            for target in summary.get('targets', list()):
+                t.append(target)
 
-        for blendShape, bsInfo in data.items():
+        return t
+
+    @staticmethod
+    def getPoints(points):  # type: (list or TypedArray) -> list
+        # the point columns are zipped at once rather than indexed point by point
+        if isinstance(points, TypedArray):
+            _, columns = points.getColumns()
+            return list(zip(*columns))
+        return points
+
+    @tracing.traced('file')
+    def import_(self):
+        for blendShape, bsInfo in self.iterItems():
             geometry = bsInfo['geometry']
 
             if geometry:
@@ -76,10 +107,11 @@ class BlendShapeFile(JsonFile):
                     type='componentList'
                 )
 
+                points = self.getPoints(targetInfo['points'])
                 pointsPattern = '{}.inputTarget[0].inputTargetGroup[{}].inputTargetItem[6000].inputPointsTarget'
                 cmds.setAttr(
                     pointsPattern.format(bs, index),
-                    len(targetInfo['points']),
-                    *targetInfo['points'],
+                    len(points),
+                    *points,
                     type='pointArray'
                 )
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from rigBuilder.core import Data, DataRecord, deepDuplicate
+
+
+def estimateSize(value):  # type: (any) -> int
+    # decoded json takes several times its size on disk, the cache budget counts the python objects instead
+    size = 0
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        size += sys.getsizeof(v)
+        if isinstance(v, dict):
+            stack.extend(v.keys())
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple)):
+            stack.extend(v)
+        elif isinstance(v, (Data, DataRecord)):
+            stack.extend(getattr(v, key) for key in (v.dataClass if isinstance(v, DataRecord) else v)._fields)
+    return size
+
+
+class FileCache(object):
+
+    def __init__(self, maxSize=256 * 1024 * 1024, useHash=False):  # type: (int, bool) -> None
+        self.maxSize = maxSize
+        self.useHash = useHash
+
+        self.entries = OrderedDict()  # type: OrderedDict[tuple: (tuple, int, any)]
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.pending = dict()  # type: dict[tuple: threading.Event]
+
+    @staticmethod
+    def getKey(path):  # type: (str) -> str
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    @staticmethod
+    def hashFile(path, chunkSize=1 << 20):  # type: (str, int) -> str
+        hasher = hashlib.sha1()
+        with open(str(path), 'rb') as f:
+            for chunk in iter(lambda: f.read(chunkSize), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def getSignature(self, path):  # type: (str) -> tuple
+        stat = os.stat(str(path))
+        signature = stat.st_mtime, stat.st_size, stat.st_ino
+        if self.useHash:
+            signature = self.hashFile(path),
+        return signature
+
+    def fetch(self, path, loader, key=()):  # type: (str, callable, tuple) -> any
+        key = (self.getKey(path),) + tuple(key)
+
+        while True:
+            signature = self.getSignature(path)
+
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None and entry[0] == signature:
+                    self.entries[key] = self.entries.pop(key)
+                    self.hits += 1
+                    return entry[2]
+
+                # another thread is already decoding this file, wait for it instead of decoding it twice
+                pending = self.pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    self.pending[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            value = loader()
+
+            # a value larger than the whole cache is never stored
+            size = estimateSize(value)
+            if size <= self.maxSize:
+                with self.lock:
+                    self.discard(key)
+                    self.entries[key] = signature, size, value
+                    self.size += size
+                    self.evict()
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+
+        return value
+
+    def load(self, path, loader, key=()):  # type: (str, callable, tuple) -> any
+        """
+        Returns a private copy of what loader() decoded from path, decoding it only if the file changed.
+        The key tells apart the different ways the same path can be decoded.
+        """
+        return deepDuplicate(self.fetch(path, loader, key=key))
+
+    def discard(self, key):  # type: (tuple) -> None
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def evict(self):
+        while self.size > self.maxSize and self.entries:
+            self.discard(next(iter(self.entries)))
+
+    def invalidate(self, path):  # type: (str) -> None
+        pathKey = self.getKey(path)
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == pathKey]:
+                self.discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+fileCache = FileCache()
@@ -0,0 +1,82 @@
+import bz2
+import gzip
+import io
+import os
+import zipfile
+from collections import OrderedDict
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+
+def openGzip(path, mode):
+    return gzip.GzipFile(str(path), mode)
+
+
+def openBz2(path, mode):
+    return bz2.BZ2File(str(path), mode)
+
+
+def openLzma(path, mode):
+    return lzma.LZMAFile(str(path), mode)
+
+
+# name: (magic bytes, extensions, opener, zip compression used when the file is an archive)
+codecs = OrderedDict((
+    ('gzip', (b'\x1f\x8b', ('.gz',), openGzip, zipfile.ZIP_DEFLATED)),
+    ('bz2', (b'BZh', ('.bz2',), openBz2, getattr(zipfile, 'ZIP_BZIP2', zipfile.ZIP_DEFLATED))),
+    ('lzma', (b'\xfd7zXZ\x00', ('.xz',), openLzma, getattr(zipfile, 'ZIP_LZMA', zipfile.ZIP_DEFLATED))),
+))
+
+
+def checkCodec(codec):  # type: (str) -> str
+    if codec is not None and codec not in codecs:
+        raise ValueError('Unknown codec {}, expected one of {}.'.format(repr(codec), ', '.join(codecs.keys())))
+    if codec == 'lzma' and lzma is None:
+        raise RuntimeError('The lzma codec is not available in this python.')
+    return codec
+
+
+def getCodecFromExtension(path):  # type: (str) -> str or None
+    extension = os.path.splitext(str(path))[1].lower()
+    for codec, (_, extensions, _, _) in codecs.items():
+        if extension in extensions:
+            return codec
+    return None
+
+
+def detectCodec(path):  # type: (str) -> str or None
+    with open(str(path), 'rb') as f:
+        header = f.read(8)
+
+    for codec, (magic, _, _, _) in codecs.items():
+        if header.startswith(magic):
+            return codec
+    return None
+
+
+def getZipCompression(codec):  # type: (str) -> int
+    if codec is None:
+        return zipfile.ZIP_STORED
+    return codecs[checkCodec(codec)][3]
+
+
+def openBinary(path, mode, codec=None):  # type: (str, str, str) -> file
+    mode = mode.replace('b', '') + 'b'
+    if codec is None:
+        return open(str(path), mode)
+    return codecs[checkCodec(codec)][2](path, mode)
+
+
+def openText(path, mode, codec=None):  # type: (str, str, str) -> file
+    if codec is None:
+        return open(str(path), mode)
+
+    f = openBinary(path, mode, codec)
+
+    # python 2 json reads and writes byte strings
+    if str is bytes:
+        return f
+    return io.TextIOWrapper(f, encoding='utf-8')
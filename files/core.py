@@ -1,50 +1,356 @@
 import json
 import os
 import importlib
+import re
+import shutil
+import tempfile
+from functools import partial
+from rigBuilder import tracing
+from rigBuilder.core import Data, DataRecord
+from rigBuilder.files import compression, jsonArchive
+from rigBuilder.files.cache import fileCache
 from rigBuilder.types import File
 from collections import OrderedDict
 
 
-def objectFactory(typeStr, kwargs):  # type: (str, dict) -> any
+serializableTypes = dict()  # type: dict[str: type]
+typeNames = dict()  # type: dict[type: str]
+
+
+def getTypeName(t):  # type: (type) -> str
+    name = typeNames.get(t)
+    if name is None:
+        name = typeNames[t] = '{}.{}'.format(t.__module__, t.__name__)
+    return name
+
+
+def registerType(t, name=None):  # type: (type, str) -> type
+    serializableTypes[name or getTypeName(t)] = t
+    return t
+
+
+def resolveType(typeStr):  # type: (str) -> type
+    t = serializableTypes.get(typeStr)
+    if t is not None:
+        return t
+
     typeStrSplit = typeStr.split('.')
     module = importlib.import_module('.'.join(typeStrSplit[:-1]))
     t = module.__getattribute__(typeStrSplit[-1])
-    return t(**kwargs)
+    return registerType(t, typeStr)
+
+
+def objectFactory(typeStr, kwargs, compact=False):  # type: (str, dict, bool) -> any
+    t = resolveType(typeStr)
+    o = t(**kwargs)
+
+    if compact and isinstance(o, Data) and o.compactable:
+        return o.compact()
+
+    return o
 
 
 def customEncoder(o):
-    cl = '{}.{}'.format(o.__module__, o.__class__.__name__)
-    return {'class': cl, 'kwargs': dict(o)}
+    if isinstance(o, jsonArchive.TypedArray):
+        return o.tolist()
+
+    t = o.dataClass if isinstance(o, DataRecord) else o.__class__
+    return {'class': getTypeName(t), 'kwargs': dict(o)}
+
 
+def customDecoder(pairs, compact=False, typedArrays=False):
+    if typedArrays:
+        pairs = [(k, typedArrayOrList(v)) for k, v in pairs]
 
-def customDecoder(pairs):
     d = OrderedDict(pairs)
 
     if 'class' in d.keys() and 'kwargs' in d.keys():
-        return objectFactory(d['class'], d['kwargs'])
+        return objectFactory(d['class'], d['kwargs'], compact=compact)
 
     return d
 
 
+def typedArrayOrList(value):  # type: (any) -> any
+    if not isinstance(value, list):
+        return value
+
+    typedArray = jsonArchive.toTypedArray(value)
+    return value if typedArray is None else typedArray
+
+
+def significantDigits(digits):  # type: (int) -> callable
+    def rounding(value):
+        # adding 0.0 turns -0.0 into 0.0
+        return float('{:.{}g}'.format(value, digits)) + 0.0
+    return rounding
+
+
+def decimalPlaces(places):  # type: (int) -> callable
+    def rounding(value):
+        return round(value, places) + 0.0
+    return rounding
+
+
+def roundFloats(value, precision, rounding=None):  # type: (any, dict, callable) -> any
+    # precision maps dict keys to the rounding applied to every float below them, None applies to the whole value
+    if rounding is None:
+        rounding = precision.get(None)
+
+    if isinstance(value, float):
+        return rounding(value) if rounding is not None else value
+
+    if isinstance(value, (Data, DataRecord)):
+        return roundFloats(customEncoder(value), precision, rounding)
+
+    if isinstance(value, jsonArchive.TypedArray):
+        value = value.tolist()
+
+    if isinstance(value, dict):
+        return OrderedDict((k, roundFloats(v, precision, precision.get(k, rounding))) for k, v in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return [roundFloats(v, precision, rounding) for v in value]
+
+    return value
+
+
+def replaceFile(source, destination):  # type: (str, str) -> None
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+        return
+
+    # python 2 can't rename over an existing file on windows
+    if os.name == 'nt' and os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
+
+
+def createTempFile(path):  # type: (str) -> (int, str)
+    directory, baseName = os.path.split(os.path.abspath(str(path)))
+    fd, tempPath = tempfile.mkstemp(prefix='.{}.'.format(baseName), suffix='.tmp', dir=directory)
+
+    # mkstemp only grants access to the owner, match what open() would have created
+    if os.path.exists(path):
+        shutil.copymode(path, tempPath)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tempPath, 0o666 & ~umask)
+
+    return fd, tempPath
+
+
+class JsonStream(object):
+
+    whitespace = re.compile(r'[ \t\n\r]*')
+    delimiters = tuple(' \t\n\r,:]}')
+
+    def __init__(self, f, decoder, chunkSize=1 << 16):  # type: (file, json.JSONDecoder, int) -> None
+        self.f = f
+        self.decoder = decoder
+        self.chunkSize = chunkSize
+
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def read(self, size=None):  # type: (int) -> bool
+        chunk = self.f.read(size or self.chunkSize)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def skipWhitespace(self):
+        while True:
+            self.position = self.whitespace.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self.read():
+                return
+
+    def expect(self, characters):  # type: (str) -> str
+        self.skipWhitespace()
+
+        if self.position >= len(self.buffer):
+            raise ValueError('Unexpected end of file, expected one of {}.'.format(repr(characters)))
+
+        character = self.buffer[self.position]
+        if character not in characters:
+            raise ValueError('Expected one of {} at position {}, got {}.'.format(
+                repr(characters), self.position, repr(character)))
+
+        self.position += 1
+        return character
+
+    def decodeValue(self):  # type: () -> any
+        self.skipWhitespace()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # a value is only complete once a delimiter follows it, numbers may continue in the next chunk
+                if self.buffer[end:end + 1] in self.delimiters or self.eof:
+                    self.position = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+
+            # grow the buffer geometrically so a large value is decoded a few times only
+            self.read(max(len(self.buffer) - self.position, self.chunkSize))
+
+    def iterItems(self):  # type: () -> iter
+        self.expect('{')
+        self.skipWhitespace()
+        if self.buffer[self.position:self.position + 1] == '}':
+            self.position += 1
+            return
+
+        while True:
+            key = self.decodeValue()
+            self.expect(':')
+            value = self.decodeValue()
+            yield key, value
+
+            if self.expect(',}') == '}':
+                return
+
+
 class JsonFile(File):
 
-    def dump(self, obj, force=False):  # type: (any, bool) -> None
+    codec = None
+    mapArrays = False
+    typedArrays = False
+    # only small files that are read whole and often should be cached, a cached value stays for the whole session
+    cached = False
+
+    indent = 4
+    precision = None  # type: dict
+
+    def dump(self, obj, force=False, codec=None, exact=True):  # type: (any, bool, str, bool) -> None
         if os.path.exists(self) and force is False:
             raise RuntimeError('The path already exists. Use -force to override it -> {}'.format(self))
 
-        self.dumps(obj)  # ensure that data is dump-able before dumping it.
+        codec = compression.checkCodec(codec or compression.getCodecFromExtension(self) or self.codec)
+
+        # rounding to the file type's precision is lossy, it is only applied when asked for
+        if self.precision and not exact:
+            obj = roundFloats(obj, self.precision)
+
+        # the data is encoded once into a temp file which only replaces the file if encoding succeeded
+        fd, tempPath = createTempFile(self)
+        os.close(fd)
+        try:
+            if self.isArchive():
+                with open(tempPath, 'wb') as f:
+                    jsonArchive.dump(
+                        obj,
+                        f,
+                        customEncoder,
+                        compression=compression.getZipCompression(codec),
+                        summarize=self.summarize,
+                    )
+            else:
+                with compression.openText(tempPath, 'w', codec) as f:
+                    separators = (',', ': ') if self.indent is not None else (',', ':')
+                    json.dump(obj, f, indent=self.indent, separators=separators, default=customEncoder)
+            replaceFile(tempPath, str(self))
+            fileCache.invalidate(self)
+        except BaseException:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+
+    def isArchive(self):  # type: () -> bool
+        return os.path.splitext(str(self))[1].lower() in jsonArchive.extensions
+
+    def isCacheable(self):  # type: () -> bool
+        # mapped arrays are views on the file, they are already cheap to load and can't be copied
+        return self.cached and not (self.mapArrays and jsonArchive.isArchive(self))
+
+    def getCacheKey(self, compact=False):  # type: (bool) -> tuple
+        return compact, self.typedArrays
+
+    def load(self, compact=False):  # type: (bool) -> any
+        if self.isCacheable():
+            return fileCache.load(self, partial(self.read, compact), key=self.getCacheKey(compact))
+        return self.read(compact)
+
+    def prefetch(self, compact=False):  # type: (bool) -> None
+        if self.isCacheable():
+            fileCache.fetch(self, partial(self.read, compact), key=self.getCacheKey(compact))
+            return
+
+        # files that aren't cached are streamed or mapped, only the system's file cache is warmed for them
+        with open(str(self), 'rb') as f:
+            while f.read(1 << 20):
+                pass
+
+    def getDecoder(self, compact=False):  # type: (bool) -> callable
+        return partial(customDecoder, compact=compact, typedArrays=self.typedArrays)
+
+    def openArchive(self, compact=False):  # type: (bool) -> jsonArchive.ArchiveReader
+        return jsonArchive.openArchive(
+            self,
+            self.getDecoder(compact=compact),
+            mapArrays=self.mapArrays,
+            typedArrays=self.typedArrays,
+        )
+
+    def read(self, compact=False):  # type: (bool) -> any
+        with tracing.span('read', 'file', path=str(self)):
+            if jsonArchive.isArchive(self):
+                with self.openArchive(compact=compact) as reader:
+                    return reader.read()
+
+            with compression.openText(self, 'r', compression.detectCodec(self)) as f:
+                return json.load(f, object_pairs_hook=self.getDecoder(compact=compact))
+
+    def iterItems(self, compact=False):  # type: (bool) -> iter
+        if jsonArchive.isArchive(self):
+            with self.openArchive(compact=compact) as reader:
+                for key, value in reader.iterItems():
+                    yield key, value
+            return
+
+        decoder = json.JSONDecoder(object_pairs_hook=self.getDecoder(compact=compact))
+        with compression.openText(self, 'r', compression.detectCodec(self)) as f:
+            for key, value in JsonStream(f, decoder).iterItems():
+                yield key, value
+
+    def summarize(self, key, value):  # type: (str, any) -> dict
+        return dict()
+
+    def summaries(self):  # type: () -> OrderedDict
+        if jsonArchive.isArchive(self):
+            with jsonArchive.openArchive(self, customDecoder) as reader:
+                return reader.summaries()
+
+        # plain json has no index, the summaries are computed from every entry
+        return OrderedDict((key, self.summarize(key, value)) for key, value in self.iterItems())
+
+    def entryNames(self):  # type: () -> List[str]
+        if jsonArchive.isArchive(self):
+            with jsonArchive.openArchive(self, customDecoder) as reader:
+                return reader.keys()
+        return [key for key, _ in self.iterItems()]
 
-        with open(str(self), 'w') as f:
-            json.dump(obj, f, indent=4, default=customEncoder)
+    def loadEntry(self, key, compact=False):  # type: (str, bool) -> any
+        if jsonArchive.isArchive(self):
+            with self.openArchive(compact=compact) as reader:
+                return reader.readEntry(key)
 
-    def load(self):  # type: () -> any
-        with open(str(self), 'r') as f:
-            return json.load(f, object_pairs_hook=customDecoder)
+        for k, value in self.iterItems(compact=compact):
+            if k == key:
+                return value
+        raise KeyError(key)
 
     @staticmethod
     def dumps(obj):
-        json.dumps(obj, indent=4, default=customEncoder)
+        return json.dumps(obj, indent=4, default=customEncoder)
 
     @staticmethod
-    def loads(string):
-        return json.loads(string, object_pairs_hook=customDecoder)
+    def loads(string, compact=False):
+        return json.loads(string, object_pairs_hook=partial(customDecoder, compact=compact))
@@ -1,10 +1,14 @@
 from maya import cmds
+from rigBuilder import tracing
 from rigBuilder.files.core import JsonFile
+from rigBuilder.files.precision import ctrlShapePrecision
 
 
 class CtrlShapeFile(JsonFile):
 
-    def export(self, ctrls=None, force=False):
+    precision = ctrlShapePrecision
+
+    def export(self, ctrls=None, force=False, exact=True):
         data = dict()
 
         if ctrls is None:
@@ -46,12 +50,11 @@ class CtrlShapeFile(JsonFile):
                 'shapes': shapesData,
             }
 
-        self.dump(data, force=force)
+        self.dump(data, force=force, exact=exact)
 
+    @tracing.traced('file')
     def import_(self, scale=1.0, useColor=True):
-        data = self.load()
-
-        for ctrl, shapesData in data.items():
+        for ctrl, shapesData in self.iterItems():
             if not cmds.objExists(ctrl):
                 continue
 
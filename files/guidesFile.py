@@ -1,15 +1,20 @@
 from collections import OrderedDict
 
 from maya import cmds
+from rigBuilder import tracing
 from rigBuilder.components.core import Guide
 from rigBuilder.files.core import JsonFile
+from rigBuilder.files.precision import guidesPrecision
 
 
 class GuidesFile(JsonFile):
 
     guideFolder = 'guides'
+    cached = True
 
-    def export(self, guidesFolder='', force=False):
+    precision = guidesPrecision
+
+    def export(self, guidesFolder='', force=False, exact=True):
         data = OrderedDict()
 
         for guide in reversed(cmds.listRelatives(guidesFolder or self.guideFolder, allDescendents=True, type='transform')):
@@ -19,8 +24,9 @@ class GuidesFile(JsonFile):
                 'locked': cmds.listAttr(guide, locked=True) or list(),
             }
 
-        self.dump(data, force=force)
+        self.dump(data, force=force, exact=exact)
 
+    @tracing.traced('file')
     def import_(self):
         data = self.load()
         namingMap = dict()
@@ -0,0 +1,394 @@
+import json
+import mmap
+import numbers
+import struct
+import sys
+import zipfile
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from rigBuilder.core import Data, DataRecord
+
+magic = b'PK\x03\x04'
+extensions = ('.jba',)
+
+dataMember = 'data.json'
+arraysMember = 'arrays.json'
+indexMember = 'index.json'
+arrayKey = '__array__'
+
+minimumArraySize = 64
+maximumRecordSize = 4
+int32Range = -2 ** 31, 2 ** 31 - 1
+plainNumberTypes = frozenset((int, type(2 ** 64), float))
+
+# blocks can only be viewed in place when the host shares the archive's byte order and memoryview can cast
+canCastBlocks = hasattr(memoryview, 'cast') and sys.byteorder == 'little'
+
+
+def isArchive(path):  # type: (str) -> bool
+    with open(str(path), 'rb') as f:
+        return f.read(len(magic)) == magic
+
+
+def toBytes(a):  # type: (array) -> bytes
+    if sys.byteorder != 'little':
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes() if hasattr(a, 'tobytes') else a.tostring()
+
+
+def fromBytes(typecode, data):  # type: (str, bytes) -> array
+    a = array(typecode)
+    if hasattr(a, 'frombytes'):
+        a.frombytes(data)
+    else:
+        a.fromstring(data)
+    if sys.byteorder != 'little':
+        a.byteswap()
+    return a
+
+
+def getTypecode(values):  # type: (list) -> str or None
+    # plain ints and floats are checked by type at once, the per value checks below are much slower
+    types = set(map(type, values))
+    if types <= plainNumberTypes:
+        if float in types:
+            return 'd'
+        return 'i' if not values or int32Range[0] <= min(values) and max(values) <= int32Range[1] else None
+
+    hasFloats = False
+    hasLargeInts = False
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, numbers.Real):
+            return None
+        if not isinstance(value, numbers.Integral):
+            hasFloats = True
+        elif not int32Range[0] <= value <= int32Range[1]:
+            hasLargeInts = True
+
+    if hasFloats:
+        return 'd'
+
+    # ints that don't fit in 32 bits would come back as floats
+    return None if hasLargeInts else 'i'
+
+
+def flatten(value):  # type: (list) -> (list, list) or None
+    depth = 0
+    first = value
+    while isinstance(first, (list, tuple)):
+        if not first:
+            return None
+        first = first[0]
+        depth += 1
+
+    # one pass per level keeps the loops in list comprehensions
+    levels = list()
+    items = [value]
+    for level in range(depth):
+        if not all(isinstance(item, (list, tuple)) for item in items):
+            return None
+        if level:
+            levels.append([len(item) for item in items])
+        items = [child for item in items for child in item]
+
+    return levels, items
+
+
+def splitColumns(value):  # type: (list) -> (list, int, list, list) or None
+    # cheap rejection of lists that don't hold numbers before walking all of them
+    first = value
+    while isinstance(first, (list, tuple)) and first:
+        first = first[0]
+    if isinstance(first, bool) or not isinstance(first, numbers.Real):
+        return None
+
+    flattened = flatten(value)
+    if flattened is None:
+        return None
+    levels, leaves = flattened
+
+    if len(leaves) < minimumArraySize:
+        return None
+
+    # short innermost lists (pairs, points...) are stored as one column per element
+    recordSize = 0
+    if levels and 0 < min(levels[-1]) == max(levels[-1]) <= maximumRecordSize:
+        recordSize = levels.pop()[0]
+        columns = [leaves[i::recordSize] for i in range(recordSize)]
+    else:
+        columns = [leaves]
+
+    typecodes = [getTypecode(column) for column in columns]
+    if None in typecodes:
+        return None
+
+    return levels, recordSize, columns, typecodes
+
+
+def toTypedArray(value):  # type: (list) -> TypedArray or None
+    split = splitColumns(value)
+    if split is None:
+        return None
+    levels, recordSize, columns, typecodes = split
+
+    columns = [array(t, column) for t, column in zip(typecodes, columns)]
+    lengths = [array('i', level) for level in levels]
+    return TypedArray(TypedArrayData(columns, lengths, recordSize))
+
+
+class TypedArrayData(object):
+
+    def __init__(self, columns, lengths, record):  # type: (list, list, int) -> None
+        self.columns = columns
+        self.lengths = lengths
+        self.record = record
+        self.offsets = [None] * len(lengths)
+
+    def getOffsets(self, level):  # type: (int) -> array
+        # computed on first access only so unused arrays never touch their pages
+        if self.offsets[level] is None:
+            offsets = array('l', [0])
+            total = 0
+            for length in self.lengths[level]:
+                total += length
+                offsets.append(total)
+            self.offsets[level] = offsets
+        return self.offsets[level]
+
+
+class TypedArray(object):
+
+    def __init__(self, data, level=0, start=0, stop=None):  # type: (TypedArrayData, int, int, int) -> None
+        self.data = data
+        self.level = level
+        self.start = start
+        if stop is None:
+            stop = len(data.lengths[0]) if data.lengths else len(data.columns[0])
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('TypedArray index out of range')
+        index += self.start
+
+        if self.level < len(self.data.lengths):
+            offsets = self.data.getOffsets(self.level)
+            return TypedArray(self.data, self.level + 1, offsets[index], offsets[index + 1])
+
+        if self.data.record:
+            return [column[index] for column in self.data.columns]
+        return self.data.columns[0][index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self.tolist())
+
+    def tolist(self):  # type: () -> list
+        return [item.tolist() if isinstance(item, TypedArray) else item for item in self]
+
+    def getColumns(self):  # type: () -> (list, list)
+        """
+        Returns the lengths of each nested level and the columns of this array's values,
+        for bulk setters that take whole arrays instead of indexing item by item.
+        """
+        levels = list()
+        start, stop = self.start, self.stop
+        for level in range(self.level, len(self.data.lengths)):
+            levels.append(self.data.lengths[level][start:stop])
+            offsets = self.data.getOffsets(level)
+            start, stop = offsets[start], offsets[stop]
+
+        return levels, [column[start:stop] for column in self.data.columns]
+
+
+class ArchiveWriter(object):
+
+    def __init__(self, zipFile, encoder):  # type: (zipfile.ZipFile, callable) -> None
+        self.zipFile = zipFile
+        self.encoder = encoder
+        self.arrays = list()
+
+    def writeBlock(self, a):  # type: (array) -> list
+        name = 'blocks/{}'.format(len(self.zipFile.namelist()))
+        self.zipFile.writestr(name, toBytes(a))
+        return [a.typecode, name]
+
+    def packArray(self, value):  # type: (list) -> dict or None
+        split = splitColumns(value)
+        if split is None:
+            return None
+        levels, recordSize, columns, typecodes = split
+
+        descriptor = {
+            'record': recordSize,
+            'levels': [self.writeBlock(array('i', lengths)) for lengths in levels],
+            'columns': [self.writeBlock(array(t, column)) for t, column in zip(typecodes, columns)],
+        }
+        self.arrays.append(descriptor)
+
+        return {arrayKey: len(self.arrays) - 1}
+
+    def encode(self, value):  # type: (any) -> any
+        if isinstance(value, (Data, DataRecord)):
+            return self.encode(self.encoder(value))
+
+        if isinstance(value, dict):
+            return OrderedDict((k, self.encode(v)) for k, v in value.items())
+
+        if isinstance(value, TypedArray):
+            value = value.tolist()
+
+        if isinstance(value, (list, tuple)):
+            placeholder = self.packArray(value)
+            if placeholder is not None:
+                return placeholder
+            return [self.encode(v) for v in value]
+
+        return value
+
+    def writeEntries(self, obj, summarize):  # type: (dict, callable) -> None
+        # each top-level entry gets its own member so it can be read without decoding the others
+        entries = list()
+        for index, (key, value) in enumerate(obj.items()):
+            member = 'entries/{}.json'.format(index)
+            self.zipFile.writestr(member, json.dumps(self.encode(value), default=self.encoder))
+            summary = summarize(key, value) if summarize is not None else dict()
+            entries.append([key, member, summary])
+
+        self.zipFile.writestr(indexMember, json.dumps({'entries': entries}, default=self.encoder))
+
+    def write(self, obj, summarize=None):  # type: (any, callable) -> None
+        if isinstance(obj, dict):
+            self.writeEntries(obj, summarize)
+        else:
+            self.zipFile.writestr(dataMember, json.dumps(self.encode(obj), default=self.encoder))
+        self.zipFile.writestr(arraysMember, json.dumps(self.arrays))
+
+
+class ArchiveReader(object):
+
+    def __init__(self, zipFile, decoder, mapped=None, typed=False):
+        # type: (zipfile.ZipFile, callable, mmap.mmap, bool) -> None
+        self.zipFile = zipFile
+        self.decoder = decoder
+        self.mapped = mapped
+        self.typed = typed
+        self.arrays = json.loads(self.zipFile.read(arraysMember).decode('utf-8'))
+
+        self.index = None
+        if indexMember in self.zipFile.namelist():
+            index = json.loads(self.zipFile.read(indexMember).decode('utf-8'), object_pairs_hook=OrderedDict)
+            self.index = OrderedDict((key, (member, summary)) for key, member, summary in index['entries'])
+
+    def getMemberRange(self, info):  # type: (zipfile.ZipInfo) -> (int, int)
+        # the data starts after the local header, whose name and extra field may differ from the central directory
+        nameLength, extraLength = struct.unpack('<HH', self.mapped[info.header_offset + 26:info.header_offset + 30])
+        start = info.header_offset + 30 + nameLength + extraLength
+        return start, start + info.file_size
+
+    def readBlock(self, block):  # type: (list) -> array or memoryview
+        typecode, name = block
+        typecode = str(typecode)
+        info = self.zipFile.getinfo(name)
+
+        if self.mapped is None or info.compress_type != zipfile.ZIP_STORED:
+            return fromBytes(typecode, self.zipFile.read(info))
+
+        start, stop = self.getMemberRange(info)
+        if canCastBlocks:
+            return memoryview(self.mapped)[start:stop].cast(typecode)
+        return fromBytes(typecode, self.mapped[start:stop])
+
+    def unpackArray(self, index):  # type: (int) -> list or TypedArray
+        descriptor = self.arrays[index]
+        columns = [self.readBlock(block) for block in descriptor['columns']]
+
+        if self.mapped is not None or self.typed:
+            lengths = [self.readBlock(block) for block in descriptor['levels']]
+            return TypedArray(TypedArrayData(columns, lengths, descriptor['record']))
+
+        if descriptor['record']:
+            value = [list(record) for record in zip(*columns)]
+        else:
+            value = columns[0].tolist()
+
+        for block in reversed(descriptor['levels']):
+            grouped = list()
+            start = 0
+            for length in self.readBlock(block):
+                grouped.append(value[start:start + length])
+                start += length
+            value = grouped
+
+        return value
+
+    def objectPairsHook(self, pairs):
+        if len(pairs) == 1 and pairs[0][0] == arrayKey:
+            return self.unpackArray(pairs[0][1])
+        return self.decoder(pairs)
+
+    def readMember(self, member):  # type: (str) -> any
+        return json.loads(self.zipFile.read(member).decode('utf-8'), object_pairs_hook=self.objectPairsHook)
+
+    def keys(self):  # type: () -> list
+        if self.index is None:
+            return list(self.read().keys())
+        return list(self.index.keys())
+
+    def summaries(self):  # type: () -> OrderedDict
+        if self.index is None:
+            return OrderedDict((key, dict()) for key in self.keys())
+        return OrderedDict((key, summary) for key, (_, summary) in self.index.items())
+
+    def readEntry(self, key):  # type: (str) -> any
+        if self.index is None:
+            return self.read()[key]
+        return self.readMember(self.index[key][0])
+
+    def iterItems(self):  # type: () -> iter
+        if self.index is None:
+            for item in self.read().items():
+                yield item
+            return
+
+        for key, (member, _) in self.index.items():
+            yield key, self.readMember(member)
+
+    def read(self):  # type: () -> any
+        if self.index is None:
+            return self.readMember(dataMember)
+        return self.decoder(list(self.iterItems()))
+
+
+def dump(obj, f, encoder, compression=zipfile.ZIP_STORED, summarize=None):
+    # type: (any, file, callable, int, callable) -> None
+    with zipfile.ZipFile(f, 'w', compression, allowZip64=True) as zipFile:
+        ArchiveWriter(zipFile, encoder).write(obj, summarize=summarize)
+
+
+@contextmanager
+def openArchive(path, decoder, mapArrays=False, typedArrays=False):
+    # type: (str, callable, bool, bool) -> ArchiveReader
+    mapped = None
+    if mapArrays:
+        with open(str(path), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with zipfile.ZipFile(str(path), 'r') as zipFile:
+        yield ArchiveReader(zipFile, decoder, mapped=mapped, typed=typedArrays)
+
+
+def load(path, decoder, mapArrays=False, typedArrays=False):  # type: (str, callable, bool, bool) -> any
+    with openArchive(path, decoder, mapArrays=mapArrays, typedArrays=typedArrays) as reader:
+        return reader.read()
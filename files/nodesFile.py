@@ -1,4 +1,5 @@
 from maya import cmds
+from rigBuilder import tracing
 from rigBuilder.files.core import JsonFile
 from rigBuilder.files.poseInterpolatorFile import getAttr, setAttr
 
@@ -93,6 +94,7 @@ class NodesFile(JsonFile):
 
         self.dump(data, force=force)
 
+    @tracing.traced('file')
     def import_(self):
         data = self.load()
         nodes = data['nodes']
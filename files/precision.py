@@ -0,0 +1,25 @@
+from rigBuilder.files.core import decimalPlaces, significantDigits
+
+# the precision of each file type, kept apart from the file classes so they can be checked without maya
+
+skinPrecision = {
+    'weights': significantDigits(6),
+    'influences': decimalPlaces(5),
+}
+
+skinLayersPrecision = {
+    None: significantDigits(6),
+}
+
+blendShapePrecision = {
+    'points': decimalPlaces(5),
+    'weight': significantDigits(6),
+}
+
+guidesPrecision = {
+    'matrix': decimalPlaces(6),
+}
+
+ctrlShapePrecision = {
+    'points': decimalPlaces(5),
+}
@@ -1,12 +1,22 @@
 import math
 
 from maya import cmds
+from maya.api import OpenMaya, OpenMayaAnim
+from rigBuilder import tracing
 from rigBuilder.files.core import JsonFile
+from rigBuilder.files.precision import skinPrecision
+from rigBuilder.files.jsonArchive import TypedArray
 
 
 class SkinFile(JsonFile):
 
-    def export(self, meshes=None, force=False):
+    mapArrays = True
+    typedArrays = True
+
+    indent = None
+    precision = skinPrecision
+
+    def export(self, meshes=None, force=False, exact=True):
 
         meshes = meshes if meshes is not None else cmds.listRelatives(
             cmds.ls(sl=True, type='transform'), type='mesh', allDescendents=True
@@ -49,7 +59,7 @@ class SkinFile(JsonFile):
                     'normalizeWeights': cmds.getAttr('{}.normalizeWeights'.format(skinCluster)),
                 }
 
-        self.dump(data, force=force)
+        self.dump(data, force=force, exact=exact)
 
     @staticmethod
     def distance(pointA, pointB):
@@ -80,10 +90,53 @@ class SkinFile(JsonFile):
 
         return None
 
+    @staticmethod
+    def getWeightColumns(weights):  # type: (list or TypedArray) -> (list, list, list)
+        # per vertex influence counts, then the influence indices and weights of every vertex one after the other
+        if isinstance(weights, TypedArray):
+            (counts,), (indices, values) = weights.getColumns()
+            return counts, indices, values
+
+        counts = [len(w) for w in weights]
+        indices = [i for w in weights for i, _ in w]
+        values = [v for w in weights for _, v in w]
+        return counts, indices, values
+
+    @classmethod
+    def setWeights(cls, skinCluster, target, influenceCount, weights):
+        # type: (str, str, int, list or TypedArray) -> None
+        counts, indices, values = cls.getWeightColumns(weights)
+
+        # the whole weight table is set in one call, the missing influences of each vertex are zero
+        table = [0.0] * (len(counts) * influenceCount)
+        position = 0
+        for vertexIndex, count in enumerate(counts):
+            row = vertexIndex * influenceCount
+            for i in range(position, position + count):
+                table[row + indices[i]] = values[i]
+            position += count
+
+        selection = OpenMaya.MSelectionList()
+        selection.add(skinCluster)
+        selection.add(target)
+        skinClusterFn = OpenMayaAnim.MFnSkinCluster(selection.getDependNode(0))
+
+        componentFn = OpenMaya.MFnSingleIndexedComponent()
+        components = componentFn.create(OpenMaya.MFn.kMeshVertComponent)
+        componentFn.addElements(list(range(len(counts))))
+
+        skinClusterFn.setWeights(
+            selection.getDagPath(1),
+            components,
+            OpenMaya.MIntArray(list(range(influenceCount))),
+            OpenMaya.MDoubleArray(table),
+            False,
+        )
+
+    @tracing.traced('file')
     def import_(self):
 
-        data = self.load()
-        for skinClusterName, info in data.items():
+        for skinClusterName, info in self.iterItems():
 
             influences = list()
             for influenceName, position in info.pop('influences'):
@@ -104,24 +157,38 @@ class SkinFile(JsonFile):
             skinCluster, = cmds.skinCluster(influences + [target], name=skinClusterName)
 
             # Set weights
-            for vertexIndex, weights in enumerate(info.pop('weights')):
-                cmds.skinPercent(
-                    skinCluster,
-                    '{}.vtx[{}]'.format(target, vertexIndex),
-                    transformValue=[(influences[i], w) for i, w in weights],
-                )
+            self.setWeights(skinCluster, target, len(influences), info.pop('weights'))
 
             # Set skinCluster parameters
             for k, v in info.items():
                 cmds.setAttr('{}.{}'.format(skinCluster, k), v)
 
+    def summarize(self, key, value):
+        return {
+            'targets': list(value.get('targets', list())),
+            'influences': [influence for influence, _ in value.get('influences', list())],
+            'vertices': len(value.get('weights', list())),
+        }
+
     @property
     def targets(self):
-        data = self.load()
-
         t = list()
-        for skinCluster, skinClusterInfo in data.items():
-            for target in skinClusterInfo.get('targets', list()):
+        for skinCluster, summary in self.summaries().items():
+            for target in summary.get('targets', list()):
                 t.append(target)
 
         return t
+
+    @property
+    def influences(self):
+        i = list()
+        for skinCluster, summary in self.summaries().items():
+            for influence in summary.get('influences', list()):
+                if influence not in i:
+                    i.append(influence)
+
+        return i
+
+    @property
+    def vertexCount(self):
+        return sum(summary.get('vertices', 0) for summary in self.summaries().values())
@@ -1,12 +1,17 @@
 from collections import OrderedDict
 
 from maya import cmds
+from rigBuilder import tracing
 from rigBuilder.files.core import JsonFile
+from rigBuilder.files.precision import skinLayersPrecision
 
 
 class SkinLayersFile(JsonFile):
 
-    def export(self, meshes=None, force=False):
+    indent = None
+    precision = skinLayersPrecision
+
+    def export(self, meshes=None, force=False, exact=True):
         from ngSkinTools2 import api
 
         meshes = meshes if meshes is not None else cmds.listRelatives(
@@ -40,8 +45,9 @@ class SkinLayersFile(JsonFile):
                 'layers': layersData,
             }
 
-        self.dump(data, force=force)
+        self.dump(data, force=force, exact=exact)
 
+    @tracing.traced('file')
     def import_(self):
         from ngSkinTools2 import api
 
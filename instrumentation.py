@@ -0,0 +1,105 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from maya import cmds
+from rigBuilder import tracing
+
+
+class CommandStats(object):
+
+    def __init__(self):
+        # (command, call site, step, component): [calls, seconds]
+        self.calls = dict()  # type: dict[tuple: list]
+        self.lock = threading.Lock()
+
+    def record(self, command, site, duration):  # type: (str, str, float) -> None
+        key = command, site, tracing.getScope('step'), tracing.getScope('component')
+        with self.lock:
+            entry = self.calls.get(key)
+            if entry is None:
+                entry = self.calls[key] = [0, 0.0]
+            entry[0] += 1
+            entry[1] += duration
+
+    def getTotals(self, by):  # type: (str) -> List[(tuple, int, float)]
+        fields = ('command', 'site', 'step', 'component')
+        indices = [fields.index(b) for b in by.split('+')]
+
+        totals = dict()
+        with self.lock:
+            for key, (calls, duration) in self.calls.items():
+                group = tuple(key[i] for i in indices)
+                total = totals.setdefault(group, [0, 0.0])
+                total[0] += calls
+                total[1] += duration
+
+        return sorted(((g, c, d) for g, (c, d) in totals.items()), key=lambda t: t[1], reverse=True)
+
+    def printReport(self, top=20):  # type: (int) -> None
+        for by in ('command', 'command+site', 'step+component'):
+            print('---> Maya commands by {}'.format(by.replace('+', ', ')))
+            print('# {:>10} {:>10}  {}'.format('calls', 'seconds', by.replace('+', ', ')))
+            for group, calls, duration in self.getTotals(by)[:top]:
+                print('# {:>10} {:>10.3f}  {}'.format(calls, duration, ', '.join(str(g) for g in group)))
+
+    def dump(self, path):  # type: (str) -> None
+        rows = [
+            {'command': c, 'site': s, 'step': st, 'component': co, 'calls': n, 'seconds': d}
+            for (c, s, st, co), (n, d) in self.calls.items()
+        ]
+        with open(str(path), 'w') as f:
+            json.dump(rows, f, indent=4)
+
+
+def wrapCommand(name, command, stats, package):  # type: (str, callable, CommandStats, str) -> callable
+    # the build's own bookkeeping queries and saves the scene too, only the rig's calls are counted
+    excluded = tuple(
+        '{}.{}'.format(package, module)
+        for module in ('instrumentation', 'tracing', 'memory', 'buildMode', 'steps.checkpoints')
+    )
+
+    def wrapper(*args, **kwargs):
+        caller = sys._getframe(1)
+        module = caller.f_globals.get('__name__', '')
+        if module in excluded or not (module == package or module.startswith(package + '.')):
+            return command(*args, **kwargs)
+
+        start = time.time()
+        try:
+            return command(*args, **kwargs)
+        finally:
+            site = '{}:{} {}'.format(module, caller.f_lineno, caller.f_code.co_name)
+            stats.record(name, site, time.time() - start)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = command.__doc__
+    return wrapper
+
+
+@contextmanager
+def countCommands(stats=None, package='rigBuilder'):  # type: (CommandStats, str) -> CommandStats
+    """
+    Counts and times the maya.cmds calls made from the package's modules, per command, call site, step and component.
+    """
+    stats = stats if stats is not None else CommandStats()
+
+    # the commands are swapped on the maya.cmds module itself so modules imported during the build are covered too
+    originals = dict()
+    for name in dir(cmds):
+        command = getattr(cmds, name)
+        if name.startswith('_') or not callable(command):
+            continue
+        originals[name] = command
+        setattr(cmds, name, wrapCommand(name, command, stats, package))
+
+    # the step and component of each call come from the tracing spans
+    tracer = tracing.Tracer(countNodes=False) if tracing.activeTracer is None else None
+    try:
+        with tracing.activate(tracer):
+            yield stats
+    finally:
+        for name, command in originals.items():
+            setattr(cmds, name, command)
@@ -0,0 +1,147 @@
+import ctypes
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import tracemalloc
+except ImportError:
+    # python 2 has no heap tracing, only the process memory is reported
+    tracemalloc = None
+
+
+def getRss():  # type: () -> int or None
+    if sys.platform.startswith('linux'):
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    if os.name == 'nt':
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', ctypes.c_ulong),
+                ('PageFaultCount', ctypes.c_ulong),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # only the peak is available here, in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def getHeap():  # type: () -> int or None
+    if tracemalloc is None or not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.get_traced_memory()[0]
+
+
+# maya is imported when measuring only, the file layer imports this module through tracing and must work without it
+def getNodeCount():  # type: () -> int
+    from maya import cmds
+    return len(cmds.ls())
+
+
+def getNodeTypes():  # type: () -> Counter
+    from maya import cmds
+    nodes = cmds.ls(showType=True) or list()
+    return Counter(nodes[1::2])
+
+
+def getConnectionCount():  # type: () -> int
+    from maya import cmds
+
+    # each connection is listed once, from its source node
+    connections = cmds.listConnections(cmds.ls(), source=False, destination=True, connections=True, plugs=True)
+    return len(connections or list()) // 2
+
+
+def measure():  # type: () -> dict
+    return {
+        'heap': getHeap(),
+        'rss': getRss(),
+        'nodeTypes': getNodeTypes(),
+        'connections': getConnectionCount(),
+    }
+
+
+def getDelta(before, after):  # type: (dict, dict) -> dict
+    def difference(key):
+        if before[key] is None or after[key] is None:
+            return None
+        return after[key] - before[key]
+
+    nodeTypes = Counter(after['nodeTypes'])
+    nodeTypes.subtract(before['nodeTypes'])
+
+    return {
+        'heap': difference('heap'),
+        'rss': difference('rss'),
+        'nodes': sum(nodeTypes.values()),
+        'nodeTypes': dict((t, c) for t, c in nodeTypes.items() if c),
+        'connections': difference('connections'),
+    }
+
+
+@contextmanager
+def trackHeap():
+    started = tracemalloc is not None and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def getReport(events):  # type: (List[dict]) -> List[dict]
+    report = list()
+    for event in events:
+        delta = event.get('args', dict()).get('memory')
+        if event.get('ph') == 'X' and delta is not None:
+            row = {'category': event['cat'], 'name': event['name'], 'start': event['ts']}
+            row.update(delta)
+            report.append(row)
+    report.sort(key=lambda r: r['start'])
+    return report
+
+
+def formatBytes(value):  # type: (int or None) -> str
+    if value is None:
+        return '-'
+    return '{:+.1f}MB'.format(value / (1024.0 * 1024.0))
+
+
+def printReport(report, topTypes=3):  # type: (List[dict], int) -> None
+    print('---> Memory and scene growth')
+    print('# {:<10} {:<24} {:>10} {:>10} {:>8} {:>8}  {}'.format(
+        'category', 'name', 'heap', 'rss', 'nodes', 'conns', 'top node types'))
+    for row in report:
+        types = sorted(row['nodeTypes'].items(), key=lambda t: abs(t[1]), reverse=True)[:topTypes]
+        print('# {:<10} {:<24} {:>10} {:>10} {:>+8} {:>8}  {}'.format(
+            row['category'],
+            row['name'],
+            formatBytes(row['heap']),
+            formatBytes(row['rss']),
+            row['nodes'],
+            '-' if row['connections'] is None else '{:+}'.format(row['connections']),
+            ', '.join('{} {:+}'.format(t, c) for t, c in types),
+        ))
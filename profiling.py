@@ -0,0 +1,58 @@
+import cProfile
+import os
+import pstats
+import re
+import time
+from collections import OrderedDict
+
+
+class StepProfiler(object):
+
+    def __init__(self, folder):  # type: (str) -> None
+        self.folder = str(folder)
+        self.statsFiles = OrderedDict()  # type: OrderedDict[str: str]
+
+    def getStatsPath(self, name):  # type: (str) -> str
+        fileName = re.sub(r'[^\w.-]', '_', name) or 'step'
+        return os.path.join(self.folder, '{:02d}_{}.prof'.format(len(self.statsFiles), fileName))
+
+    def run(self, name, func, *args, **kwargs):  # type: (str, callable, any, any) -> any
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            path = self.getStatsPath(name)
+            profiler.dump_stats(path)
+            self.statsFiles[name] = path
+
+    def getHotspots(self, top=20):  # type: (int) -> List[tuple]
+        # own time, cumulative time and calls of each function summed over the steps, with the step spending the most
+        totals = dict()
+        for name, path in self.statsFiles.items():
+            for func, (_, calls, ownTime, cumulativeTime, _) in pstats.Stats(path).stats.items():
+                total = totals.setdefault(func, [0.0, 0.0, 0, dict()])
+                total[0] += ownTime
+                total[1] += cumulativeTime
+                total[2] += calls
+                total[3][name] = total[3].get(name, 0.0) + ownTime
+
+        hotspots = list()
+        for func, (ownTime, cumulativeTime, calls, steps) in totals.items():
+            step = max(steps, key=steps.get)
+            hotspots.append((ownTime, cumulativeTime, calls, pstats.func_std_string(func), step))
+
+        hotspots.sort(key=lambda h: h[0], reverse=True)
+        return hotspots[:top]
+
+    def printHotspots(self, top=20):  # type: (int) -> None
+        print('---> Top {} hotspots across {} steps, stats saved in {}'.format(top, len(self.statsFiles), self.folder))
+        print('# {:>10} {:>10} {:>10}  {:<24} {}'.format('own (s)', 'cum (s)', 'calls', 'step', 'function'))
+        for ownTime, cumulativeTime, calls, func, step in self.getHotspots(top=top):
+            print('# {:>10.3f} {:>10.3f} {:>10}  {:<24} {}'.format(ownTime, cumulativeTime, calls, step, func))
+
+
+def getProfileFolder(root):  # type: (str) -> str
+    return os.path.join(str(root), '.profiles', time.strftime('%Y%m%d_%H%M%S'))
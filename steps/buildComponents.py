@@ -1,9 +1,12 @@
+import os
+
 from .core import Step
+from .. import buildMode
 from ..files.core import JsonFile
 
 
 class ComponentBuilderFile(JsonFile):
-    pass
+    cached = True
 
 
 class BuildComponents(Step):
@@ -13,6 +16,16 @@ class BuildComponents(Step):
         self.file = ComponentBuilderFile(file)
         self.controlSet = bool(controlSet)
 
+    def inputFiles(self, workspace=''):
+        return [ComponentBuilderFile(self.file.replace('...', workspace))]
+
+    def inputSize(self, workspace=''):
+        f = ComponentBuilderFile(self.file.replace('...', workspace))
+        if not os.path.isfile(f):
+            return 0
+        componentBuilder = f.load()
+        return len([key for key in componentBuilder.componentDict if key not in componentBuilder.disabledComponents])
+
     def build(self, workspace=''):
         f = ComponentBuilderFile(self.file.replace('...', workspace))
-        f.load().build(controlSet=self.controlSet)
+        f.load().build(controlSet=self.controlSet, fast=buildMode.isActive())
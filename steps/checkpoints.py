@@ -0,0 +1,123 @@
+import os
+import re
+from collections import OrderedDict
+
+from maya import cmds
+from rigBuilder.core import Data
+from rigBuilder.files.core import JsonFile
+
+
+def normalizeRecord(record):  # type: (list) -> list
+    name, paramsHash, inputHashes = record
+    return [name, paramsHash, [list(i) for i in inputHashes]]
+
+
+class Checkpoint(Data):
+
+    sceneType = 'mayaBinary'
+    sceneExtension = '.mb'
+
+    def __init__(self, step='', index=0, fingerprints=None, records=None, scene=''):
+        # type: (str, int, List[(str, str)], List[(str, str, List[(str, str)])], str) -> None
+        super(Checkpoint, self).__init__()
+        self.step = str(step)
+        self.index = int(index)
+        self.fingerprints = [list(f) for f in fingerprints] if fingerprints is not None else list()
+        self.records = [normalizeRecord(r) for r in records] if records is not None else list()
+        self.scene = str(scene)
+
+    def getFileName(self):  # type: () -> str
+        # step names are free text, the index keeps names that only differ by their replaced characters apart
+        return '{:02d}_{}'.format(self.index, re.sub(r'[^\w.-]', '_', self.step) or 'step')
+
+    def getManifestPath(self, folder):  # type: (str) -> str
+        return os.path.join(str(folder), '{}.json'.format(self.getFileName()))
+
+    def isValid(self, fingerprints):  # type: (List[(str, str)]) -> bool
+        # the scene is only reusable if every step up to it ran with the same parameters and inputs
+        expected = [list(f) for f in fingerprints[:self.index + 1]]
+        return self.fingerprints == expected and os.path.isfile(self.scene)
+
+    def save(self, folder):  # type: (str) -> None
+        if not os.path.isdir(str(folder)):
+            os.makedirs(str(folder))
+
+        self.scene = os.path.join(str(folder), '{}{}'.format(self.getFileName(), self.sceneExtension))
+
+        # exporting leaves the scene's name and type alone, an untitled scene must not end up named after the checkpoint
+        cmds.file(self.scene, exportAll=True, type=self.sceneType, preserveReferences=True, force=True)
+
+        JsonFile(self.getManifestPath(folder)).dump(self, force=True)
+
+    def restore(self):
+        sceneName = cmds.file(q=True, sn=True)
+        cmds.file(self.scene, open=True, force=True)
+
+        # the next save must not overwrite the checkpoint, an untitled scene stays untitled
+        cmds.file(rename=sceneName or 'untitled')
+
+
+def getCheckpoints(folder):  # type: (str) -> List[Checkpoint]
+    if not os.path.isdir(str(folder)):
+        return list()
+
+    checkpoints = list()
+    for fileName in sorted(os.listdir(str(folder))):
+        if not fileName.endswith('.json'):
+            continue
+        try:
+            checkpoint = JsonFile(os.path.join(str(folder), fileName)).load()
+        except ValueError:
+            continue
+        if isinstance(checkpoint, Checkpoint):
+            checkpoints.append(checkpoint)
+
+    return checkpoints
+
+
+def findCheckpoint(folder, fingerprints):  # type: (str, List[(str, str)]) -> Checkpoint or None
+    valid = [c for c in getCheckpoints(folder) if c.isValid(fingerprints)]
+    if not valid:
+        return None
+    return max(valid, key=lambda c: c.index)
+
+
+def explainRebuild(folder, records, checkpoint=None):  # type: (str, list, Checkpoint) -> OrderedDict
+    startIndex = checkpoint.index + 1 if checkpoint is not None else 0
+
+    # the furthest checkpoint remembers what every step ran with last time, even if it is outdated now
+    checkpoints = getCheckpoints(folder)
+    previous = max(checkpoints, key=lambda c: c.index).records if checkpoints else list()
+
+    reasons = OrderedDict()
+    changedStep = None
+    for index, record in enumerate(records):
+        name, paramsHash, inputHashes = normalizeRecord(record)
+
+        if index < startIndex:
+            reasons[name] = 'skipped, unchanged since checkpoint \'{}\''.format(checkpoint.step)
+            continue
+
+        reason = None
+        if index >= len(previous):
+            reason = 'no previous build recorded'
+        elif previous[index][0] != name:
+            reason = 'steps were added, removed or reordered'
+        elif previous[index][1] != paramsHash:
+            reason = 'parameters changed'
+        else:
+            changedInputs = [path for path, digest in inputHashes if [path, digest] not in previous[index][2]]
+            if changedInputs or len(inputHashes) != len(previous[index][2]):
+                reason = 'inputs changed: {}'.format(', '.join(changedInputs) or 'input list')
+
+        if reason is not None and changedStep is None:
+            changedStep = name
+        elif reason is None:
+            if changedStep is not None:
+                reason = 'unchanged, but follows \'{}\''.format(changedStep)
+            else:
+                reason = 'unchanged, but no checkpoint was saved after it'
+
+        reasons[name] = 'rebuilt, {}'.format(reason)
+
+    return reasons
@@ -1,17 +1,99 @@
-from rigBuilder.core import Data
+from rigBuilder import buildMode, instrumentation, memory, profiling, tracing
+from rigBuilder.core import Data, expand
+import hashlib
+import json
+import os
+import tempfile
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
+from rigBuilder.files.cache import FileCache
+from rigBuilder.files.core import JsonFile
+from rigBuilder.steps import planning
+from rigBuilder.steps.checkpoints import Checkpoint, explainRebuild, findCheckpoint
+from rigBuilder.steps.watch import StepWatcher
 from rigBuilder.types import Path
 
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
 
 class Step(Data):
 
     def build(self, workspace=''):
         pass
 
+    def inputFiles(self, workspace=''):  # type: (str) -> List[File]
+        return list()
+
+    def outputFiles(self, workspace=''):  # type: (str) -> List[str] or None
+        # None means the step may write anything, every later step then depends on it
+        return list()
+
+    def inputSize(self, workspace=''):  # type: (str) -> int
+        # steps only compare their size with steps of the same type, the file size is a fallback for any step
+        return sum(os.path.getsize(str(f)) for f in self.inputFiles(workspace=workspace) if os.path.isfile(str(f)))
+
+    def getInputHashes(self, workspace=''):  # type: (str) -> List[(str, str)]
+        hashes = list()
+        for f in self.inputFiles(workspace=workspace):
+            hashes.append((str(f), FileCache.hashFile(f) if os.path.isfile(str(f)) else None))
+        return hashes
+
+    def fingerprint(self, workspace='', inputHashes=None):  # type: (str, List[(str, str)]) -> str
+        inputHashes = inputHashes if inputHashes is not None else self.getInputHashes(workspace=workspace)
+
+        hasher = hashlib.sha1(self.contentHash().encode('utf-8'))
+        for path, digest in inputHashes:
+            hasher.update(path.encode('utf-8'))
+            hasher.update((digest or 'missing').encode('utf-8'))
+        return hasher.hexdigest()
+
+
+class Prefetcher(object):
+
+    def __init__(self, workers=2):  # type: (int) -> None
+        self.queue = Queue()
+        self.threads = [threading.Thread(target=self.work) for _ in range(workers)]
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+
+    def work(self):
+        while True:
+            f = self.queue.get()
+            if f is None:
+                return
+            try:
+                with tracing.span('prefetch', 'file', path=str(f)):
+                    f.prefetch()
+            except Exception:
+                # the step reading the file reports the error when it runs
+                pass
+
+    def submit(self, files):  # type: (List[File]) -> None
+        for f in files:
+            if isinstance(f, JsonFile):
+                self.queue.put(f)
+
+    def stop(self):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
 
 class StepBuilder(Data):
 
+    compactable = False
+
+    # seconds of steps an incremental build runs before it keeps a checkpoint, unless the checkpoints are given
+    checkpointInterval = 10.0
+
     def __init__(self, stepDict=None, disabledSteps=None, workspace=''):
         # type: (dict[str: Step], List[str], str) -> None
         super(StepBuilder, self).__init__()
@@ -20,17 +102,302 @@ class StepBuilder(Data):
         self.disabledSteps = disabledSteps if disabledSteps is not None else list()
         self.stepDict = stepDict if stepDict is not None else dict()
 
-    def build(self):
+    def getEnabledSteps(self):  # type: () -> List[(str, Step)]
+        return [(name, expand(step)) for name, step in self.stepDict.items() if name not in self.disabledSteps]
+
+    def getDependencies(self, steps=None):  # type: (List[(str, Step)]) -> OrderedDict
+        steps = steps if steps is not None else self.getEnabledSteps()
+
+        dependencies = OrderedDict()
+        writers = dict()  # type: dict[str: str]
+        barrier = None
+        for name, step in steps:
+            inputs = [os.path.normcase(os.path.abspath(str(f))) for f in step.inputFiles(workspace=self.workspace)]
+            dependencies[name] = set(writers[i] for i in inputs if i in writers)
+            if barrier is not None:
+                dependencies[name].add(barrier)
+
+            outputs = step.outputFiles(workspace=self.workspace)
+            if outputs is None:
+                barrier = name
+            else:
+                for output in outputs:
+                    writers[os.path.normcase(os.path.abspath(str(output)))] = name
+
+        return dependencies
+
+    def getRecords(self, steps=None):  # type: (List[(str, Step)]) -> List[(str, str, List[(str, str)])]
+        steps = steps if steps is not None else self.getEnabledSteps()
+        return [(name, step.contentHash(), step.getInputHashes(workspace=self.workspace)) for name, step in steps]
+
+    def getFingerprints(self, steps=None, records=None):  # type: (List[(str, Step)], list) -> List[(str, str)]
+        steps = steps if steps is not None else self.getEnabledSteps()
+        records = records if records is not None else self.getRecords(steps)
+
+        # each fingerprint covers the step and all the steps before it
+        fingerprints = list()
+        hasher = hashlib.sha1()
+        for (name, step), (_, _, inputHashes) in zip(steps, records):
+            hasher.update(name.encode('utf-8'))
+            hasher.update(step.fingerprint(workspace=self.workspace, inputHashes=inputHashes).encode('utf-8'))
+            fingerprints.append((name, hasher.copy().hexdigest()))
+        return fingerprints
+
+    def getOutputFolder(self):  # type: () -> str
+        if self.workspace:
+            return str(self.workspace)
+        return os.path.join(tempfile.gettempdir(), 'rigBuilder')
+
+    def getCheckpointFolder(self):  # type: () -> str
+        return os.path.join(self.getOutputFolder(), '.checkpoints')
+
+    def getReportFolder(self):  # type: () -> str
+        folder = os.path.join(self.getOutputFolder(), '.reports')
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        return folder
+
+    @staticmethod
+    def getTimingsPath():  # type: () -> str
+        # shared by every workspace, the estimates compare steps of the same type across characters
+        return os.path.join(os.path.expanduser('~'), 'rigBuilderStepTimes.json')
+
+    def plan(self, fast=True, resume=False, checkpointFolder=None, incremental=False, timings=None):
+        # type: (bool, bool, str, bool, str) -> List[(str, str, str, int, float)]
+        """
+        Lists what a build would do without building: each step's type, whether it would run,
+        its input size and its estimated duration in seconds from the previous builds.
+        """
+        timings = planning.loadTimings(timings or self.getTimingsPath())
+        steps = self.getEnabledSteps()
+
+        upToDate = set()
+        if resume or incremental:
+            fingerprints = self.getFingerprints(steps)
+            checkpoint = findCheckpoint(checkpointFolder or self.getCheckpointFolder(), fingerprints)
+            if checkpoint is not None:
+                upToDate = set(name for name, _ in steps[:checkpoint.index + 1])
+
+        plan = list()
+        for name, step in self.stepDict.items():
+            step = expand(step)
+            stepType = step.__class__.__name__
+            if name in self.disabledSteps:
+                plan.append((name, stepType, 'disabled', None, None))
+            elif name in upToDate:
+                plan.append((name, stepType, 'up to date', None, None))
+            else:
+                size = step.inputSize(workspace=self.workspace)
+                estimate = planning.getEstimate(timings, stepType, size, fast=fast)
+                plan.append((name, stepType, 'run', size, estimate))
+
+        planning.printPlan(plan)
+        return plan
+
+    def build(
+            self,
+            prefetch=2,
+            checkpoints=None,
+            resume=False,
+            checkpointFolder=None,
+            incremental=False,
+            trace=None,
+            profile=False,
+            countCommands=False,
+            measureMemory=False,
+            fast=True,
+            dgEvaluation=False,
+            timings=False,
+            compareModes=False,
+    ):
+        # type: (int, List[str], bool, str, bool, str, bool or str, bool, bool, bool, bool, bool or str, bool) -> None
+        tracer = tracing.Tracer(measureMemory=measureMemory) if trace or measureMemory else None
+        commandStats = instrumentation.CommandStats() if countCommands else None
+
+        profiler = None
+        if profile:
+            folder = profile if not isinstance(profile, bool) else profiling.getProfileFolder(self.getOutputFolder())
+            profiler = profiling.StepProfiler(folder)
+
+        with tracing.activate(tracer), self.countCommands(commandStats), self.trackHeap(measureMemory):
+            with self.fastBuild(fast, dgEvaluation), tracing.span('build', 'build', countNodes=True):
+                total, stepTimes = self.buildSteps(
+                    prefetch=prefetch,
+                    checkpoints=checkpoints,
+                    resume=resume,
+                    checkpointFolder=checkpointFolder,
+                    incremental=incremental,
+                    profiler=profiler,
+                    measureSizes=bool(timings),
+                )
+
+        if timings:
+            self.recordTimings(timings if not isinstance(timings, bool) else self.getTimingsPath(), fast, stepTimes)
+
+        # a resumed build only times part of the steps and can't be compared with a full one
+        if compareModes and not resume and not incremental:
+            self.compareBuildModes(fast, total, stepTimes)
+
+        if trace:
+            tracer.dump(trace)
+            print('---> Trace written to {}'.format(trace))
+
+        if measureMemory:
+            report = memory.getReport(tracer.events)
+            memory.printReport(report)
+            path = os.path.join(self.getReportFolder(), 'memory_{}.json'.format(time.strftime('%Y%m%d_%H%M%S')))
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=4)
+            print('---> Memory report written to {}'.format(path))
+
+        if profiler is not None:
+            profiler.printHotspots()
+
+        if commandStats is not None:
+            commandStats.printReport()
+            path = os.path.join(self.getReportFolder(), 'commands_{}.json'.format(time.strftime('%Y%m%d_%H%M%S')))
+            commandStats.dump(path)
+            print('---> Maya command counts written to {}'.format(path))
+
+    @staticmethod
+    def recordTimings(path, fast, stepTimes):  # type: (str, bool, List[(str, str, float, int)]) -> None
+        # the build itself succeeded, failing to keep its timings must not fail it
+        try:
+            planning.recordTimings(path, fast, stepTimes)
+        except Exception as e:
+            print('---> Step timings not recorded: {}'.format(e))
+
+    def compareBuildModes(self, fast, total, stepTimes):  # type: (bool, float, List[(str, str, float, int)]) -> None
+        # the build itself succeeded, failing to keep its timings must not fail it
+        try:
+            path = os.path.join(self.getReportFolder(), 'buildTimes.json')
+            build = buildMode.recordBuild(path, fast, total, stepTimes)
+            comparison = buildMode.getComparison(buildMode.loadHistory(path), build)
+        except Exception as e:
+            print('---> Build times not recorded: {}'.format(e))
+            return
+
+        if comparison is not None:
+            buildMode.printComparison(comparison)
+
+    def watch(self, interval=1.0, checkpointFolder=None, fast=True, build=True):
+        # type: (float, str, bool, bool) -> None
+        StepWatcher(self, checkpointFolder=checkpointFolder, fast=fast).run(interval=interval, build=build)
+
+    @staticmethod
+    @contextmanager
+    def trackHeap(measureMemory):  # type: (bool) -> None
+        if not measureMemory:
+            yield
+            return
+        with memory.trackHeap():
+            yield
+
+    @staticmethod
+    @contextmanager
+    def fastBuild(fast, dgEvaluation):  # type: (bool, bool) -> None
+        if not fast:
+            yield
+            return
+        with buildMode.fastBuild(dgEvaluation=dgEvaluation):
+            yield
+
+    @staticmethod
+    @contextmanager
+    def countCommands(commandStats):  # type: (instrumentation.CommandStats) -> None
+        if commandStats is None:
+            yield
+            return
+        with instrumentation.countCommands(commandStats):
+            yield
+
+    def buildSteps(
+            self,
+            prefetch=2,
+            checkpoints=None,
+            resume=False,
+            checkpointFolder=None,
+            incremental=False,
+            profiler=None,
+            measureSizes=False,
+    ):
+        # type: (int, List[str], bool, str, bool, profiling.StepProfiler, bool) -> (float, List[(str, str, float, int)])
         start = time.time()
         print('---> Build starts')
+
+        steps = self.getEnabledSteps()
+        dependencies = self.getDependencies(steps)
+
+        # an incremental build resumes from the last unchanged checkpoint, saving a scene after every step would
+        # often cost more than the steps, without given checkpoints it keeps one once the steps took long enough
+        autoCheckpoints = incremental and checkpoints is None
+        resume = resume or incremental
+
+        checkpoints = checkpoints if checkpoints is not None else list()
+        checkpointFolder = checkpointFolder or self.getCheckpointFolder()
+        records = self.getRecords(steps) if checkpoints or resume else None
+        fingerprints = self.getFingerprints(steps, records) if records is not None else None
+
+        startIndex = 0
+        if resume:
+            checkpoint = findCheckpoint(checkpointFolder, fingerprints)
+            if checkpoint is not None:
+                print('---> Resuming after \'{}\' from {}'.format(checkpoint.step, checkpoint.scene))
+                with tracing.span('restore checkpoint', 'checkpoint', step=checkpoint.step):
+                    checkpoint.restore()
+                startIndex = checkpoint.index + 1
+
+            for stepName, reason in explainRebuild(checkpointFolder, records, checkpoint).items():
+                print('# {}: {}'.format(stepName, reason))
+
+        # the next steps' files are read on threads while maya runs the current step, the steps themselves stay serial
+        prefetcher = Prefetcher() if prefetch else None
+        submitted = set()
+        done = set(name for name, _ in steps[:startIndex])
+
         stepTimes = list()
-        for name, step in self.stepDict.items():
-            if name in self.disabledSteps:
-                continue
-            startStep = time.time()
-            step.build(workspace=self.workspace)
-            stepTime = round(time.time() - startStep, 2)
-            stepTimes.append((name, stepTime))
-        print('---> Build stops: {} seconds'.format(round(time.time() - start), 2))
-        for stepName, stepTime in stepTimes:
+        sinceCheckpoint = 0.0
+        try:
+            for index, (name, step) in enumerate(steps):
+                if index < startIndex:
+                    continue
+
+                if prefetcher is not None:
+                    for nextName, nextStep in steps[index:index + prefetch + 1]:
+                        if nextName not in submitted and dependencies[nextName] <= done:
+                            submitted.add(nextName)
+                            prefetcher.submit(nextStep.inputFiles(workspace=self.workspace))
+
+                # measuring may read the step's files, it's only done for the timing history
+                size = step.inputSize(workspace=self.workspace) if measureSizes else None
+
+                startStep = time.time()
+                with tracing.span(name, 'step', countNodes=True, type=step.__class__.__name__):
+                    if profiler is not None:
+                        profiler.run(name, step.build, workspace=self.workspace)
+                    else:
+                        step.build(workspace=self.workspace)
+                stepTime = round(time.time() - startStep, 2)
+                stepTimes.append((name, step.__class__.__name__, stepTime, size))
+                done.add(name)
+
+                sinceCheckpoint += stepTime
+                if name in checkpoints or (autoCheckpoints and sinceCheckpoint >= self.checkpointInterval):
+                    sinceCheckpoint = 0.0
+                    with tracing.span('save checkpoint', 'checkpoint', step=name):
+                        Checkpoint(
+                            step=name,
+                            index=index,
+                            fingerprints=fingerprints[:index + 1],
+                            records=records[:index + 1],
+                        ).save(checkpointFolder)
+        finally:
+            if prefetcher is not None:
+                prefetcher.stop()
+
+        total = round(time.time() - start, 2)
+        print('---> Build stops: {} seconds'.format(total))
+        for stepName, _, stepTime, _ in stepTimes:
             print('# {}: {} seconds'.format(stepName, stepTime))
+
+        return total, stepTimes
@@ -13,5 +13,8 @@ class CustomScript(Step):
         super(CustomScript, self).__init__(**kwargs)
         self.script = Script(script)
 
+    def outputFiles(self, workspace=''):
+        return None
+
     def build(self, workspace=''):
         self.script.execute()
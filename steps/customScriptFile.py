@@ -12,6 +12,12 @@ class CustomScriptFile(Step):
         super(CustomScriptFile, self).__init__()
         self.file = PythonFile(file)
 
+    def inputFiles(self, workspace=''):
+        return [PythonFile(self.file.replace('...', workspace))]
+
+    def outputFiles(self, workspace=''):
+        return None
+
     def build(self, workspace=''):
         f = PythonFile(self.file.replace('...', workspace))
         execfile(f)
@@ -12,6 +12,9 @@ class ExportFile(Step):
         self.force = bool(force)
         self.type = str(type)
 
+    def outputFiles(self, workspace=''):
+        return [MayaFile(self.file.replace('...', workspace))]
+
     def build(self, workspace=''):
         f = MayaFile(self.file.replace('...', workspace))
 
@@ -11,5 +11,8 @@ class ImportCorrectives(Step):
         self.shapeFile = BlendShapeFile(shapeFile)
         self.driverFile = File(driverFile)
 
+    def inputFiles(self, workspace=''):
+        return [self.shapeFile]
+
     def build(self, workspace=''):
         self.shapeFile.import_()
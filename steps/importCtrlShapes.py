@@ -10,6 +10,9 @@ class ImportCtrlShapes(Step):
         self.scale = float(scale)
         self.useColor = bool(useColor)
 
+    def inputFiles(self, workspace=''):
+        return [self.file]
+
     def build(self, workspace=''):
         self.file.import_(scale=self.scale, useColor=self.useColor)
 
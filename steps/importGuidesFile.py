@@ -9,6 +9,9 @@ class ImportGuidesFile(Step):
         super(ImportGuidesFile, self).__init__(**kwargs)
         self.file = GuidesFile(file)
 
+    def inputFiles(self, workspace=''):
+        return [GuidesFile(self.file.replace('...', workspace))]
+
     def build(self, workspace=''):
         f = GuidesFile(self.file.replace('...', workspace))
         f.import_()
@@ -1,3 +1,4 @@
+from rigBuilder import tracing
 from rigBuilder.steps.core import Step
 from maya import cmds
 from rigBuilder.types import Path
@@ -5,6 +6,7 @@ from rigBuilder.types import Path
 
 class MayaFile(Path):
 
+    @tracing.traced('file')
     def import_(self):
         cmds.file(self, i=True)
 
@@ -15,6 +17,9 @@ class ImportMayaFile(Step):
         super(ImportMayaFile, self).__init__(**kwargs)
         self.file = MayaFile(file)
 
+    def inputFiles(self, workspace=''):
+        return [MayaFile(self.file.replace('...', workspace))]
+
     def build(self, workspace=''):
         f = MayaFile(self.file.replace('...', workspace))
         f.import_()
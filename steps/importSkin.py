@@ -1,3 +1,6 @@
+import os
+
+from rigBuilder.files import jsonArchive
 from rigBuilder.files.skinFile import SkinFile
 from rigBuilder.steps.core import Step
 
@@ -8,6 +11,17 @@ class ImportSkin(Step):
         super(ImportSkin, self).__init__()
         self.file = SkinFile(file)
 
+    def inputFiles(self, workspace=''):
+        return [SkinFile(self.file.replace('...', workspace))]
+
+    def inputSize(self, workspace=''):
+        f = SkinFile(self.file.replace('...', workspace))
+        if not os.path.isfile(f) or not jsonArchive.isArchive(f):
+            # counting the vertices of plain json means decoding all of it, and a file size would be compared
+            # with the archives' vertex counts, an unknown size keeps the estimate on the median instead
+            return 0
+        return f.vertexCount
+
     def build(self, workspace=''):
         f = SkinFile(self.file.replace('...', workspace))
         f.import_()
@@ -22,6 +22,9 @@ class ImportSkin2(Step):
         self.mesh = Node(mesh)
         self.method = SkinMethod(method)
 
+    def inputFiles(self, workspace=''):
+        return [SkinFile2(self.file.replace('...', workspace))]
+
     def build(self, workspace=''):
         f = SkinFile2(self.file.replace('...', workspace))
         f.import_(self.mesh, method=self.method)
@@ -0,0 +1,79 @@
+import os
+
+from rigBuilder.files.core import JsonFile
+
+# samples kept per step type, the oldest are dropped first
+samplesPerType = 50
+
+
+def loadTimings(path):  # type: (str) -> dict
+    if not os.path.isfile(path):
+        return dict()
+
+    # a history another machine left unreadable only costs the estimates
+    try:
+        timings = JsonFile(path).load()
+    except (IOError, OSError, ValueError):
+        return dict()
+    return timings if isinstance(timings, dict) else dict()
+
+
+def recordTimings(path, fast, steps):  # type: (str, bool, List[(str, str, float, int)]) -> None
+    timings = loadTimings(path)
+    for _, stepType, seconds, size in steps:
+        samples = timings.setdefault(stepType, list())
+        samples.append([size, seconds, fast])
+        del samples[:-samplesPerType]
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    # the history is shared by the farm's workers, the file is replaced whole so it's never seen half written
+    JsonFile(path).dump(timings, force=True)
+
+
+def median(values):  # type: (list) -> float
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def getEstimate(timings, stepType, size, fast=True):  # type: (dict, str, int, bool) -> float or None
+    samples = timings.get(stepType, list())
+
+    # builds in the other mode are only used when there are none in the requested one
+    sameMode = [s for s in samples if s[2] == fast]
+    samples = sameMode or samples
+    if not samples:
+        return None
+
+    # the time is assumed to grow linearly with the input size, steps without sizes use the plain median
+    sized = [(s[0], s[1]) for s in samples if s[0]]
+    if size and sized:
+        return round(median([seconds / float(sampleSize) for sampleSize, seconds in sized]) * size, 2)
+    return round(median([s[1] for s in samples]), 2)
+
+
+def printPlan(plan):  # type: (List[(str, str, str, int, float)]) -> None
+    total = 0.0
+    unknown = 0
+    print('---> Build plan')
+    for name, stepType, status, size, estimate in plan:
+        if status != 'run':
+            print('# {} ({}): {}'.format(name, stepType, status))
+            continue
+
+        if estimate is None:
+            unknown += 1
+            print('# {} ({}): run, size {}, no timing history'.format(name, stepType, size))
+        else:
+            total += estimate
+            print('# {} ({}): run, size {}, ~{} seconds'.format(name, stepType, size, estimate))
+
+    message = '---> Estimated build time: {} seconds'.format(round(total, 2))
+    if unknown:
+        message += ' ({} steps without history)'.format(unknown)
+    print(message)
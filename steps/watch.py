@@ -0,0 +1,109 @@
+import os
+import time
+from collections import OrderedDict
+
+
+class StepWatcher(object):
+    """
+    Polls the input files of a StepBuilder's steps and rebuilds it incrementally when they change.
+    """
+
+    def __init__(self, stepBuilder, checkpointFolder=None, fast=True):  # type: (StepBuilder, str, bool) -> None
+        self.stepBuilder = stepBuilder
+        self.checkpointFolder = checkpointFolder
+        self.fast = fast
+
+        self.signatures = self.getSignatures()
+        self.changed = set()
+
+    def setStepBuilder(self, stepBuilder):  # type: (StepBuilder) -> None
+        self.stepBuilder = stepBuilder
+        self.signatures = self.getSignatures()
+        self.changed = set()
+
+    def getPaths(self):  # type: () -> List[str]
+        workspace = self.stepBuilder.workspace
+        steps = self.stepBuilder.getEnabledSteps()
+
+        # files the build writes itself would trigger a new build after every build
+        outputs = set()
+        for _, step in steps:
+            for f in step.outputFiles(workspace=workspace) or list():
+                outputs.add(os.path.normcase(os.path.abspath(str(f))))
+
+        paths = list()
+        for _, step in steps:
+            for f in step.inputFiles(workspace=workspace):
+                path = os.path.normcase(os.path.abspath(str(f)))
+                if path not in paths and path not in outputs:
+                    paths.append(path)
+        return paths
+
+    @staticmethod
+    def getSignature(path):  # type: (str) -> tuple or None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def getSignatures(self):  # type: () -> OrderedDict
+        return OrderedDict((path, self.getSignature(path)) for path in self.getPaths())
+
+    def poll(self):  # type: () -> List[str]
+        """
+        Returns the files that changed since the last build, once they stopped changing between two polls.
+        """
+        signatures = self.getSignatures()
+        changed = set(path for path, signature in signatures.items() if self.signatures.get(path) != signature)
+        self.signatures = signatures
+
+        # editors often write a file in several passes, the build waits for a poll without any new change
+        if changed:
+            self.changed.update(changed)
+            return list()
+
+        changed = sorted(self.changed)
+        self.changed = set()
+        return changed
+
+    def build(self):
+        # the checkpoints' fingerprints include the input files, the build resumes before the first affected step
+        try:
+            self.stepBuilder.build(incremental=True, checkpointFolder=self.checkpointFolder, fast=self.fast)
+        finally:
+            self.signatures = self.getSignatures()
+            self.changed = set()
+
+    def tryBuild(self):  # type: () -> bool
+        try:
+            self.build()
+        except Exception as e:
+            # a broken file shouldn't stop the watch, the next save may fix it
+            print('---> Build failed: {}'.format(e))
+            return False
+        return True
+
+    def update(self):  # type: () -> bool
+        changed = self.poll()
+        if not changed:
+            return False
+
+        for path in changed:
+            print('---> Changed: {}'.format(path))
+        return self.tryBuild()
+
+    def run(self, interval=1.0, build=True):  # type: (float, bool) -> None
+        """
+        Blocks until interrupted, for mayapy sessions.
+        """
+        if build:
+            self.tryBuild()
+
+        print('---> Watching {} files, press Ctrl+C to stop'.format(len(self.signatures)))
+        try:
+            while True:
+                time.sleep(interval)
+                self.update()
+        except KeyboardInterrupt:
+            print('---> Watch stopped')
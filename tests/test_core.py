@@ -0,0 +1,54 @@
+import unittest
+
+from rigBuilder.core import Data
+
+
+class Leaf(Data):
+
+    def __init__(self, value=0):
+        super(Leaf, self).__init__()
+        self.value = value
+
+
+class Branch(Data):
+
+    def __init__(self, name='', leafDict=None, disabled=None):
+        super(Branch, self).__init__()
+        self.name = name
+        self.leafDict = leafDict if leafDict is not None else dict()
+        self.disabled = disabled if disabled is not None else list()
+
+
+class ContentHashTest(unittest.TestCase):
+
+    def test_reassignedField(self):
+        leaf = Leaf(1)
+        digest = leaf.contentHash()
+        leaf.value = 2
+        self.assertNotEqual(leaf.contentHash(), digest)
+
+    def test_dictChangedInPlace(self):
+        branch = Branch(leafDict={'a': Leaf(1)})
+        digest = branch.contentHash()
+        branch.leafDict['b'] = Leaf(2)
+        self.assertNotEqual(branch.contentHash(), digest)
+
+    def test_listChangedInPlace(self):
+        branch = Branch()
+        digest = branch.contentHash()
+        branch.disabled.append('a')
+        self.assertNotEqual(branch.contentHash(), digest)
+
+    def test_nestedDataChanged(self):
+        leaf = Leaf(1)
+        branch = Branch(leafDict={'a': leaf})
+        digest = branch.contentHash()
+        leaf.value = 2
+        self.assertNotEqual(branch.contentHash(), digest)
+
+    def test_sameContentSameHash(self):
+        self.assertEqual(Branch(leafDict={'a': Leaf(1)}).contentHash(), Branch(leafDict={'a': Leaf(1)}).contentHash())
+
+
+if __name__ == '__main__':
+    unittest.main()
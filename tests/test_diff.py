@@ -0,0 +1,46 @@
+import unittest
+
+from rigBuilder.core import Data
+from rigBuilder.diff import diff, patch
+
+
+class Leaf(Data):
+
+    def __init__(self, value=0):
+        super(Leaf, self).__init__()
+        self.value = value
+
+
+class Branch(Data):
+
+    def __init__(self, leafDict=None):
+        super(Branch, self).__init__()
+        self.leafDict = leafDict if leafDict is not None else dict()
+
+
+class DiffTest(unittest.TestCase):
+
+    def test_same(self):
+        self.assertIsNone(diff(Branch({'a': Leaf(1)}), Branch({'a': Leaf(1)})))
+
+    def test_changedInPlaceAfterDiff(self):
+        a = Branch({'a': Leaf(1)})
+        b = Branch({'a': Leaf(1)})
+        self.assertIsNone(diff(a, b))
+
+        b.leafDict['d'] = Leaf(2)
+        delta = diff(a, b)
+        self.assertIsNotNone(delta)
+        self.assertEqual(patch(a, delta), b)
+
+    def test_nestedChangedAfterDiff(self):
+        a = Branch({'a': Leaf(1)})
+        b = Branch({'a': Leaf(1)})
+        self.assertIsNone(diff(a, b))
+
+        b.leafDict['a'].value = 3
+        self.assertEqual(patch(a, diff(a, b)), b)
+
+
+if __name__ == '__main__':
+    unittest.main()
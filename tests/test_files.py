@@ -0,0 +1,161 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from rigBuilder.core import Data
+from rigBuilder.files.core import JsonFile, decimalPlaces, significantDigits, roundFloats
+from rigBuilder.files.precision import skinPrecision, blendShapePrecision, guidesPrecision, skinLayersPrecision
+
+
+class SkinData(JsonFile):
+    indent = None
+    precision = skinPrecision
+
+
+class BlendShapeData(JsonFile):
+    indent = None
+    precision = blendShapePrecision
+
+
+class GuidesData(JsonFile):
+    precision = guidesPrecision
+
+
+class SkinLayersData(JsonFile):
+    indent = None
+    precision = skinLayersPrecision
+
+
+class Target(Data):
+
+    def __init__(self, points=None, weight=1.0):
+        super(Target, self).__init__()
+        self.points = points if points is not None else list()
+        self.weight = weight
+
+
+def isWithin(value, expected, tolerance):  # type: (float, float, float) -> bool
+    return abs(value - expected) <= tolerance
+
+
+class RoundingTest(unittest.TestCase):
+
+    def test_significantDigits(self):
+        rounding = significantDigits(3)
+        self.assertEqual(rounding(0.000123456), 0.000123)
+        self.assertEqual(rounding(123456.0), 123000.0)
+
+    def test_decimalPlaces(self):
+        rounding = decimalPlaces(2)
+        self.assertEqual(rounding(1.23456), 1.23)
+        self.assertEqual(rounding(0.000123456), 0.0)
+
+    def test_negativeZero(self):
+        for value in (significantDigits(6)(-0.0), decimalPlaces(5)(-0.0), decimalPlaces(5)(-0.000000001)):
+            self.assertEqual(value, 0.0)
+            self.assertEqual(math.copysign(1.0, value), 1.0)
+
+    def test_keys(self):
+        value = roundFloats({'a': 1.23456, 'b': {'a': [1.23456]}, 'c': 1.23456}, {'a': decimalPlaces(1)})
+        self.assertEqual(value, {'a': 1.2, 'b': {'a': [1.2]}, 'c': 1.23456})
+
+    def test_fallback(self):
+        # None rounds every float no other key covers
+        value = roundFloats({'a': 1.23456, 'b': [1.23456]}, {None: decimalPlaces(2), 'a': decimalPlaces(1)})
+        self.assertEqual(value, {'a': 1.2, 'b': [1.23]})
+
+    def test_nonFloats(self):
+        value = roundFloats({'a': [1, True, 'name', None]}, {None: decimalPlaces(1)})
+        self.assertEqual(value, {'a': [1, True, 'name', None]})
+
+
+class PrecisionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def dumpAndLoad(self, fileType, data, extension='.json'):  # type: (type, any, str) -> any
+        f = fileType(os.path.join(self.folder, 'data' + extension))
+        f.dump(data, exact=False)
+        return f.load()
+
+    def test_skin(self):
+        weights = [[[0, 0.1234567891], [3, 0.8765432109]], [[1, 1e-9]]]
+        data = {'skinCluster1': {
+            'weights': weights,
+            'influences': [['joint1', [1.123456789, -2.000000001, 0.0]]],
+            'envelope': 0.123456789123,
+        }}
+        loaded = self.dumpAndLoad(SkinData, data)['skinCluster1']
+
+        for vertex, loadedVertex in zip(weights, loaded['weights']):
+            for (index, weight), (loadedIndex, loadedWeight) in zip(vertex, loadedVertex):
+                self.assertEqual(loadedIndex, index)
+                self.assertTrue(isWithin(loadedWeight, weight, abs(weight) * 1e-5))
+        self.assertEqual(loaded['weights'][0][0][1], 0.123457)
+
+        self.assertEqual(loaded['influences'][0][0], 'joint1')
+        for value, expected in zip(loaded['influences'][0][1], [1.123456789, -2.000000001, 0.0]):
+            self.assertTrue(isWithin(value, expected, 0.5e-5))
+
+        # keys without a precision are kept as they are
+        self.assertEqual(loaded['envelope'], 0.123456789123)
+
+    def test_skinArchive(self):
+        weights = [[[0, 0.1234567891], [3, 0.8765432109]] for _ in range(10)]
+        loaded = self.dumpAndLoad(SkinData, {'skinCluster1': {'weights': weights}}, extension='.jba')
+        self.assertEqual(list(loaded['skinCluster1']['weights'][0][1]), [3, 0.876543])
+
+    def test_blendShape(self):
+        points = [[0.123456789, -0.000000001, 1.0, 1.0], [2.999999999, 0.5, -0.25, 1.0]]
+        data = {'blendShape1': {'targets': {'smile': {'points': points, 'weight': 0.333333333333}}}}
+        loaded = self.dumpAndLoad(BlendShapeData, data)['blendShape1']['targets']['smile']
+
+        for point, loadedPoint in zip(points, loaded['points']):
+            for value, loadedValue in zip(point, loadedPoint):
+                self.assertTrue(isWithin(loadedValue, value, 0.5e-5))
+        self.assertEqual(math.copysign(1.0, loaded['points'][0][1]), 1.0)
+        self.assertEqual(loaded['weight'], 0.333333)
+
+    def test_guides(self):
+        matrix = [1.0, 1e-17, 0.0, 0.0, -1e-17, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 12.3456789, -0.0000001, 5.0, 1.0]
+        data = {'guide1': {'parent': 'guides', 'matrix': matrix, 'locked': ['rx']}}
+        loaded = self.dumpAndLoad(GuidesData, data)['guide1']
+
+        for value, expected in zip(loaded['matrix'], matrix):
+            self.assertTrue(isWithin(value, expected, 0.5e-6))
+        for value in loaded['matrix']:
+            self.assertEqual(math.copysign(1.0, value), 1.0)
+        self.assertEqual(loaded['parent'], 'guides')
+        self.assertEqual(loaded['locked'], ['rx'])
+
+    def test_fallback(self):
+        data = {'layer1': {'weights': [0.1234567891, 12345.67891], 'opacity': 0.99999999}}
+        loaded = self.dumpAndLoad(SkinLayersData, data)['layer1']
+        self.assertEqual(loaded['weights'], [0.123457, 12345.7])
+        self.assertEqual(loaded['opacity'], 1.0)
+
+    def test_exact(self):
+        data = {'skinCluster1': {'weights': [[[0, 0.1234567891]]]}}
+        f = SkinData(os.path.join(self.folder, 'data.json'))
+        f.dump(data)
+        self.assertEqual(f.load(), data)
+
+    def test_data(self):
+        # Data objects are rounded by their fields, like the dicts they are dumped as
+        data = {'blendShape1': {'targets': [Target(points=[[0.123456789, -1e-9]], weight=0.123456789)]}}
+        target = self.dumpAndLoad(BlendShapeData, data)['blendShape1']['targets'][0]
+
+        self.assertIsInstance(target, Target)
+        self.assertEqual(target.points, [[0.12346, 0.0]])
+        self.assertEqual(math.copysign(1.0, target.points[0][1]), 1.0)
+        self.assertEqual(target.weight, 0.123457)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import unittest
+import zipfile
+
+from rigBuilder.files import jsonArchive
+
+
+def getWeights(count):  # type: (int) -> list
+    return [[[i % 4, (i * 7 % 10) / 10.0] for i in range(v % 3 + 1)] for v in range(count)]
+
+
+class TypedArrayTest(unittest.TestCase):
+
+    def test_flatten(self):
+        self.assertEqual(jsonArchive.flatten([[[1, 2], [3]], [[4, 5, 6]]]), ([[2, 1], [2, 1, 3]], [1, 2, 3, 4, 5, 6]))
+        self.assertIsNone(jsonArchive.flatten([[1], 2]))
+        self.assertIsNone(jsonArchive.flatten([]))
+
+    def test_typecode(self):
+        self.assertEqual(jsonArchive.getTypecode([1, 2, 3]), 'i')
+        self.assertEqual(jsonArchive.getTypecode([1, 2.0]), 'd')
+        self.assertIsNone(jsonArchive.getTypecode([1, 2 ** 40]))
+        self.assertIsNone(jsonArchive.getTypecode([1, True]))
+        self.assertIsNone(jsonArchive.getTypecode([1, 'a']))
+
+    def test_roundTrip(self):
+        weights = getWeights(100)
+        self.assertEqual(jsonArchive.toTypedArray(weights).tolist(), weights)
+
+    def test_columns(self):
+        weights = getWeights(100)
+        (counts,), (indices, values) = jsonArchive.toTypedArray(weights).getColumns()
+
+        self.assertEqual(list(counts), [len(w) for w in weights])
+        self.assertEqual(list(indices), [i for w in weights for i, _ in w])
+        self.assertEqual(list(values), [v for w in weights for _, v in w])
+
+    def test_columnsOfItem(self):
+        weights = getWeights(100)
+        levels, columns = jsonArchive.toTypedArray(weights)[5].getColumns()
+
+        self.assertEqual(levels, list())
+        self.assertEqual([list(record) for record in zip(*columns)], weights[5])
+
+    def test_archiveColumns(self):
+        weights = getWeights(100)
+        f = io.BytesIO()
+        jsonArchive.dump({'weights': weights}, f, None)
+        f.seek(0)
+
+        with zipfile.ZipFile(f) as zipFile:
+            reader = jsonArchive.ArchiveReader(zipFile, dict, typed=True)
+            typedArray = reader.readEntry('weights')
+
+        (counts,), (indices, values) = typedArray.getColumns()
+        self.assertEqual(list(counts), [len(w) for w in weights])
+        self.assertEqual(list(values), [v for w in weights for _, v in w])
+
+
+if __name__ == '__main__':
+    unittest.main()
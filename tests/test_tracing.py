@@ -0,0 +1,43 @@
+import unittest
+
+from rigBuilder import tracing
+
+
+class Limb(object):
+
+    @tracing.traced('component')
+    def ikSetup(self):
+        return 'limb'
+
+    @tracing.traced('component')
+    def fkSetup(self):
+        return 'limb'
+
+
+class Leg(Limb):
+
+    @tracing.traced('component')
+    def ikSetup(self):
+        return super(Leg, self).ikSetup()
+
+
+class TracedTest(unittest.TestCase):
+
+    def getSpanNames(self, method):  # type: (callable) -> List[str]
+        tracer = tracing.Tracer(countNodes=False)
+        with tracing.activate(tracer):
+            method()
+        return [event['name'] for event in tracer.events if event['ph'] == 'X']
+
+    def test_override(self):
+        self.assertEqual(sorted(self.getSpanNames(Leg().ikSetup)), ['Leg.ikSetup', 'Limb.ikSetup'])
+
+    def test_inherited(self):
+        self.assertEqual(self.getSpanNames(Leg().fkSetup), ['Limb.fkSetup'])
+
+    def test_inactive(self):
+        self.assertEqual(Leg().ikSetup(), 'limb')
+
+
+if __name__ == '__main__':
+    unittest.main()
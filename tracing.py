@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from rigBuilder import memory
+
+activeTracer = None  # type: Tracer
+
+
+class NullSpan(object):
+
+    def __enter__(self):
+        return dict()
+
+    def __exit__(self, *args):
+        return False
+
+
+nullSpan = NullSpan()
+
+
+class Tracer(object):
+
+    def __init__(self, countNodes=True, measureMemory=False):  # type: (bool, bool) -> None
+        self.countNodes = countNodes
+        self.measureMemory = measureMemory
+        self.events = list()
+        self.threadNames = dict()
+        self.lock = threading.Lock()
+        self.origin = time.time()
+        self.local = threading.local()
+
+    def getTimestamp(self):  # type: () -> float
+        # chrome traces are in microseconds
+        return (time.time() - self.origin) * 1e6
+
+    def getOpenSpans(self):  # type: () -> List[(str, str)]
+        # (category, name) of the spans open on this thread, outermost first
+        if not hasattr(self.local, 'spans'):
+            self.local.spans = list()
+        return self.local.spans
+
+    def record(self, event):  # type: (dict) -> None
+        thread = threading.current_thread()
+        event['pid'] = os.getpid()
+        event['tid'] = thread.ident
+        with self.lock:
+            self.threadNames[thread.ident] = thread.name
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category='', countNodes=False, **args):  # type: (str, str, bool, any) -> dict
+        countNodes = countNodes and self.countNodes
+        nodes = memory.getNodeCount() if countNodes else None
+        measured = memory.measure() if countNodes and self.measureMemory else None
+
+        openSpans = self.getOpenSpans()
+        openSpans.append((category, name))
+
+        start = self.getTimestamp()
+        try:
+            # the caller can add its own counters to the yielded args
+            yield args
+        finally:
+            end = self.getTimestamp()
+            openSpans.pop()
+            if countNodes:
+                nodesAfter = memory.getNodeCount()
+                args['nodes'] = nodesAfter
+                args['createdNodes'] = nodesAfter - nodes
+                self.counter('nodes', nodes=nodesAfter)
+
+            if measured is not None:
+                args['memory'] = memory.getDelta(measured, memory.measure())
+
+            self.record({'name': name, 'cat': category, 'ph': 'X', 'ts': start, 'dur': end - start, 'args': args})
+
+    def counter(self, name, **values):  # type: (str, any) -> None
+        self.record({'name': name, 'ph': 'C', 'ts': self.getTimestamp(), 'args': values})
+
+    def getTrace(self):  # type: () -> dict
+        with self.lock:
+            metadata = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                for tid, name in self.threadNames.items()
+            ]
+            return {'traceEvents': metadata + list(self.events), 'displayTimeUnit': 'ms'}
+
+    def dump(self, path):  # type: (str) -> None
+        with open(str(path), 'w') as f:
+            json.dump(self.getTrace(), f)
+
+
+@contextmanager
+def activate(tracer):  # type: (Tracer) -> Tracer
+    global activeTracer
+
+    # without a tracer the current one, if any, keeps recording
+    if tracer is None:
+        yield activeTracer
+        return
+
+    previousTracer = activeTracer
+    activeTracer = tracer
+    try:
+        yield tracer
+    finally:
+        activeTracer = previousTracer
+
+
+def span(name, category='', countNodes=False, **args):  # type: (str, str, bool, any) -> NullSpan
+    if activeTracer is None:
+        return nullSpan
+    return activeTracer.span(name, category=category, countNodes=countNodes, **args)
+
+
+def getScope(category):  # type: (str) -> str or None
+    # name of the outermost open span of this category, e.g. the step or component being built
+    if activeTracer is None:
+        return None
+    for spanCategory, name in activeTracer.getOpenSpans():
+        if spanCategory == category:
+            return name
+    return None
+
+
+def counter(name, **values):  # type: (str, any) -> None
+    if activeTracer is not None:
+        activeTracer.counter(name, **values)
+
+
+def getDefiningClass(instance, name, method):  # type: (any, str, callable) -> type
+    # overrides calling a traced base method nest two spans, naming them after the instance's class hides which is which
+    for cls in type(instance).__mro__:
+        if cls.__dict__.get(name) is method:
+            return cls
+    return type(instance)
+
+
+def traced(category=''):  # type: (str) -> callable
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if activeTracer is None:
+                return func(*args, **kwargs)
+
+            name = '{}.{}'.format(getDefiningClass(args[0], func.__name__, wrapper).__name__, func.__name__) \
+                if args else func.__name__
+            with activeTracer.span(name, category=category, target=str(args[0]) if args else ''):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
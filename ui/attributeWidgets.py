@@ -146,7 +146,7 @@ class FileWidget(AttributeWidget):
 
 class JsonFileWidget(AttributeWidget):
 
-    filter = 'Json File (*.json)'
+    filter = 'Json File (*.json *.jba *.gz *.bz2 *.xz)'
 
     def __init__(self, cl):
         super(JsonFileWidget, self).__init__(cl)
@@ -219,7 +219,7 @@ class ComponentBuilderWidget(FileWidget):
 
 
 class GuidesFileWidget(FileWidget):
-    filter = 'Json File (*.json)'
+    filter = 'Json File (*.json *.jba *.gz *.bz2 *.xz)'
 
     def __init__(self, cl):
         super(GuidesFileWidget, self).__init__(cl)
@@ -243,7 +243,7 @@ class GuidesFileWidget(FileWidget):
 
 class SkinFileWidget(FileWidget):
 
-    filter = 'Json File (*.json)'
+    filter = 'Json File (*.json *.jba *.gz *.bz2 *.xz)'
 
     def __init__(self, cl):
         super(SkinFileWidget, self).__init__(cl)
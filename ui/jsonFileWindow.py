@@ -66,6 +66,7 @@ class JsonFileWindow(QtWidgets.QMainWindow):
 
         # file
         self._file = None
+        self.savedHash = None
 
         # title
         self.title = str(title) if title is not None else self.__class__.__name__
@@ -156,14 +157,7 @@ class JsonFileWindow(QtWidgets.QMainWindow):
             self.recentFilesMenu.addAction(action)
 
     def askOpenRecent(self, path):
-        result = QtWidgets.QMessageBox.question(
-            self,
-            "File Not Saved",
-            "Continue anyways?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
-        )
-
-        if result == QtWidgets.QMessageBox.No:
+        if not self.askDiscardChanges():
             return
 
         self.open(path)
@@ -176,24 +170,31 @@ class JsonFileWindow(QtWidgets.QMainWindow):
         pass
 
     def save(self, path, force=False):
+        data = self.getData()
         self.file = JsonFile(path)
-        self.file.dump(self.getData(), force=force)
+        self.file.dump(data, force=force)
+        self.savedHash = data.contentHash()
         print('{} -> File saved: {}'.format(self.title, self.file))
 
     def open(self, path):
         f = JsonFile(path)
         self.refresh(f.load())
         self.file = f
+        self.savedHash = self.getData().contentHash()
         print('{} -> File opened: {}'.format(self.title, self.file))
 
     def clear(self):
         self.file = None
         self.refresh()
+        self.savedHash = self.getData().contentHash()
 
-    def refresh(self, data=None):  # type: (Data) -> None
-        pass
+    def isModified(self):  # type: () -> bool
+        return self.getData().contentHash() != self.savedHash
+
+    def askDiscardChanges(self):  # type: () -> bool
+        if not self.isModified():
+            return True
 
-    def askNew(self):
         result = QtWidgets.QMessageBox.question(
             self,
             "File Not Saved",
@@ -201,7 +202,13 @@ class JsonFileWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
         )
 
-        if result == QtWidgets.QMessageBox.No:
+        return result != QtWidgets.QMessageBox.No
+
+    def refresh(self, data=None):  # type: (Data) -> None
+        pass
+
+    def askNew(self):
+        if not self.askDiscardChanges():
             return
 
         self.clear()
@@ -220,14 +227,7 @@ class JsonFileWindow(QtWidgets.QMainWindow):
         self.save(path, force=True)
 
     def askOpen(self):
-        result = QtWidgets.QMessageBox.question(
-            self,
-            "File Not Saved",
-            "Continue anyways?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
-        )
-
-        if result == QtWidgets.QMessageBox.No:
+        if not self.askDiscardChanges():
             return
 
         caption = '{}: Open File'.format(self.title)
@@ -238,14 +238,7 @@ class JsonFileWindow(QtWidgets.QMainWindow):
         self.saveSettings()
 
     def closeEvent(self, event):
-        result = QtWidgets.QMessageBox.question(
-            self,
-            "File Not Saved",
-            "Continue anyways?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
-        )
-
-        if result == QtWidgets.QMessageBox.No:
+        if not self.askDiscardChanges():
             event.ignore()
         else:
             self.saveSettings()
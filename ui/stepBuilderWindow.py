@@ -1,6 +1,6 @@
 from functools import partial
 
-from PySide2 import QtWidgets, QtGui
+from PySide2 import QtWidgets, QtGui, QtCore
 from maya import cmds, mel
 from rigBuilder.files.skinFile import SkinFile
 from .attributeWidgets import ScriptWidget, FileWidget, NodeWidget, ComponentBuilderWidget, SkinFileWidget, \
@@ -11,6 +11,8 @@ from ..files.guidesFile import GuidesFile
 from ..files.skinFile2 import SkinFile2
 from ..steps.buildComponents import BuildComponents, ComponentBuilderFile
 from ..steps.core import StepBuilder
+from ..steps.watch import StepWatcher
+from ..profiling import StepProfiler, getProfileFolder
 from ..steps.customScript import CustomScript, Script
 from ..steps.customScriptFile import PythonFile, CustomScriptFile
 from ..steps.exportFile import ExportFile
@@ -48,28 +50,45 @@ class StepDictList(DataDictList):
         ImportCtrlShapes,
     ]
 
-    def __init__(self, workspaceWidget):
+    def __init__(self, workspaceWidget, fastCheckBox):
         super(StepDictList, self).__init__()
 
         self.workspaceWidget = workspaceWidget
+        self.fastCheckBox = fastCheckBox
 
     def populateContextMenu(self):
 
         buildAction = QtWidgets.QAction('Build', self)
-        buildAction.triggered.connect(self.build)
+        buildAction.triggered.connect(lambda: self.build())
         if not self.selectedItems():
             buildAction.setEnabled(False)
 
+        profileAction = QtWidgets.QAction('Build and Profile', self)
+        profileAction.triggered.connect(lambda: self.build(profile=True))
+        if not self.selectedItems():
+            profileAction.setEnabled(False)
+
         menu = super(StepDictList, self).populateContextMenu()
         menu.addSeparator()
         menu.addAction(buildAction)
+        menu.addAction(profileAction)
 
         return menu
 
-    def build(self):
-        for item in self.selectedItems():
-            step = item.d
-            step.build(workspace=self.workspaceWidget.workspace)
+    def build(self, profile=False):
+        workspace = self.workspaceWidget.workspace
+        profiler = StepProfiler(getProfileFolder(StepBuilder(workspace=workspace).getOutputFolder())) if profile else None
+
+        with StepBuilder.fastBuild(self.fastCheckBox.isChecked(), False):
+            for item in self.selectedItems():
+                step = item.d
+                if profiler is not None:
+                    profiler.run(item.text(0), step.build, workspace=workspace)
+                else:
+                    step.build(workspace=workspace)
+
+        if profiler is not None:
+            profiler.printHotspots()
 
 
 class StepAttributeEditor(DataAttributeEditor):
@@ -145,19 +164,41 @@ class StepBuilderWindow(JsonFileWindow):
 
         self.workspaceWidget = WorkspaceWidget()
 
+        self.fastCheckBox = QtWidgets.QCheckBox('Fast')
+        self.fastCheckBox.setToolTip('Build without undo, viewport refresh and autosave')
+        self.fastCheckBox.setChecked(True)
+
         self.stepEditor = DataDictEditor(
-            dataDictList=StepDictList(self.workspaceWidget),
+            dataDictList=StepDictList(self.workspaceWidget, self.fastCheckBox),
             dataAttributeEditor=StepAttributeEditor()
         )
 
         buildBtn = QtWidgets.QPushButton('Build')
         buildBtn.clicked.connect(self.build)
 
+        self.profileCheckBox = QtWidgets.QCheckBox('Profile')
+
+        self.watchCheckBox = QtWidgets.QCheckBox('Watch')
+        self.watchCheckBox.setToolTip('Rebuild from the last checkpoint when an input file changes')
+        self.watchCheckBox.toggled.connect(self.watch)
+
+        self.watcher = None
+        self.watchTimer = QtCore.QTimer(self)
+        self.watchTimer.setInterval(1000)
+        self.watchTimer.timeout.connect(self.updateWatcher)
+
+        buildLayout = QtWidgets.QHBoxLayout()
+        buildLayout.addWidget(buildBtn)
+        buildLayout.addWidget(self.fastCheckBox)
+        buildLayout.addWidget(self.profileCheckBox)
+        buildLayout.addWidget(self.watchCheckBox)
+        buildLayout.setStretch(0, 1)
+
         layout = QtWidgets.QVBoxLayout()
         layout.setMargin(0)
         layout.addWidget(self.workspaceWidget)
         layout.addWidget(self.stepEditor)
-        layout.addWidget(buildBtn)
+        layout.addLayout(buildLayout)
         layout.setStretch(1, 1)
 
         self.mainLayout.addLayout(layout)
@@ -169,23 +210,64 @@ class StepBuilderWindow(JsonFileWindow):
             workspace=self.workspaceWidget.workspace
         )
 
-    def build(self):
-        build = True
+    def askSaveScene(self):  # type: () -> bool
         if cmds.file(q=True, modified=True):
             result = AskToSave(parent=self, title='Warning: Scene not saved', text='Save scene before continuing?').exec_()
             if result == AskToSave.cancel:
-                build = False
+                return False
             elif result == AskToSave.save:
                 mel.eval('SaveSceneAs')
                 if cmds.file(q=True, modified=True):
-                    build = False
+                    return False
+        return True
 
-        if not build:
+    def build(self):
+        if not self.askSaveScene():
             print('Build Canceled')
             return
 
         stepBuilder = self.getData()
-        stepBuilder.build()
+        stepBuilder.build(profile=self.profileCheckBox.isChecked(), fast=self.fastCheckBox.isChecked())
+
+    def watch(self, enabled):  # type: (bool) -> None
+        self.watchTimer.stop()
+        self.watcher = None
+        if not enabled:
+            print('---> Watch stopped')
+            return
+
+        # the first build may open a checkpoint over the current scene
+        if not self.askSaveScene():
+            print('Watch Canceled')
+            self.watchCheckBox.blockSignals(True)
+            self.watchCheckBox.setChecked(False)
+            self.watchCheckBox.blockSignals(False)
+            return
+
+        self.watcher = StepWatcher(self.getData(), fast=self.fastCheckBox.isChecked())
+        self.watcher.tryBuild()
+        print('---> Watching {} files'.format(len(self.watcher.signatures)))
+        self.watchTimer.start()
+
+    def updateWatcher(self):
+        # steps edited in the window since the last poll are watched and built from now on
+        data = self.getData()
+        if data.contentHash() != self.watcher.stepBuilder.contentHash():
+            self.watcher.setStepBuilder(data)
+
+        self.watcher.update()
+
+    def closeEvent(self, event):
+        super(StepBuilderWindow, self).closeEvent(event)
+        if not event.isAccepted():
+            return
+
+        # the timer is parented to the window, a hidden window would keep polling and building
+        self.watchTimer.stop()
+        self.watcher = None
+        self.watchCheckBox.blockSignals(True)
+        self.watchCheckBox.setChecked(False)
+        self.watchCheckBox.blockSignals(False)
 
     def refresh(self, data=None):  # type: (StepBuilder) -> None
         data = StepBuilder() if data is None else data